@@ -0,0 +1,60 @@
+from collections import deque
+
+# A queue of timed steps (card moves, overlays, AI "thinking" pauses) that the
+# frame loop plays one after another without blocking. Each step runs for a
+# duration in milliseconds; `draw(progress)` is called every frame with
+# progress going from 0 to 1 and `done()` once it finishes (or is skipped).
+# The game only moves on when the timeline is idle.
+
+class Step:
+    __slots__ = ('duration', 'draw', 'done')
+
+    def __init__(self, duration, draw=None, done=None):
+        self.duration = duration
+        self.draw = draw
+        self.done = done
+
+class Timeline:
+    def __init__(self, speed=1.0):
+        self.speed = speed  # 2.0 plays twice as fast, 0 skips every step
+        self.steps = deque()
+        self.started = None  # Time the current step started
+        self.progress = 0.0
+
+    def add(self, duration, draw=None, done=None):
+        self.steps.append(Step(duration, draw, done))
+
+    def busy(self):
+        return bool(self.steps)
+
+    # Move the timeline on to `now` (ms), finishing any steps whose time is up
+    def update(self, now):
+        while self.steps:
+            step = self.steps[0]
+            if self.started is None:
+                self.started = now
+            duration = step.duration / self.speed if self.speed else 0
+            elapsed = now - self.started
+            if duration and elapsed < duration:
+                self.progress = elapsed / duration
+                return
+            self._finish()
+
+    # Draw the current step; False if it doesn't draw anything itself
+    def draw(self):
+        if not self.steps or self.started is None or self.steps[0].draw is None:
+            return False
+        self.steps[0].draw(self.progress)
+        return True
+
+    # Finish everything queued right away, including steps queued while finishing
+    def skip(self):
+        while self.steps:
+            self._finish()
+
+    def _finish(self):
+        step = self.steps.popleft()
+        self.started = None
+        self.progress = 0.0
+        if step.done:
+            step.done()
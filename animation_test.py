@@ -0,0 +1,78 @@
+import unittest
+
+from animation import Timeline
+
+class TimelineTest(unittest.TestCase):
+    def setUp(self):
+        self.log = []
+
+    def step(self, timeline, name, duration, draws=True):
+        draw = (lambda progress: self.log.append((name, round(progress, 2)))) if draws else None
+        timeline.add(duration, draw, lambda: self.log.append((name, 'done')))
+
+    def test_steps_play_one_after_another(self):
+        timeline = Timeline()
+        self.step(timeline, 'a', 100)
+        self.step(timeline, 'b', 200)
+        timeline.update(1000)
+        timeline.draw()
+        timeline.update(1050)
+        timeline.draw()
+        timeline.update(1100)  # a is over; b starts now
+        timeline.update(1200)
+        timeline.draw()
+        self.assertTrue(timeline.busy())
+        timeline.update(1300)
+        self.assertFalse(timeline.busy())
+        self.assertEqual(self.log, [('a', 0.0), ('a', 0.5), ('a', 'done'), ('b', 0.5), ('b', 'done')])
+
+    def test_speed_scales_durations(self):
+        timeline = Timeline(speed=2)
+        self.step(timeline, 'a', 100)
+        timeline.update(0)
+        timeline.update(25)
+        self.assertEqual(timeline.progress, 0.5)
+        timeline.update(50)
+        self.assertFalse(timeline.busy())
+
+    def test_speed_zero_finishes_every_step_at_once(self):
+        timeline = Timeline(speed=0)
+        self.step(timeline, 'a', 100)
+        self.step(timeline, 'b', 100)
+        timeline.update(0)
+        self.assertFalse(timeline.busy())
+        self.assertEqual(self.log, [('a', 'done'), ('b', 'done')])
+
+    def test_draw_is_false_without_a_drawing_step(self):
+        timeline = Timeline()
+        self.assertFalse(timeline.draw())
+        self.step(timeline, 'pause', 100, draws=False)
+        timeline.update(0)
+        self.assertFalse(timeline.draw())
+        self.step(timeline, 'a', 100)
+        timeline.update(100)
+        self.assertTrue(timeline.draw())
+
+    def test_skip_finishes_steps_queued_while_finishing(self):
+        timeline = Timeline()
+
+        def queue_more():
+            self.log.append(('a', 'done'))
+            self.step(timeline, 'b', 100)
+
+        timeline.add(100, None, queue_more)
+        timeline.update(0)
+        timeline.skip()
+        self.assertFalse(timeline.busy())
+        self.assertEqual(self.log, [('a', 'done'), ('b', 'done')])
+
+    def test_a_step_added_later_starts_when_updated(self):
+        timeline = Timeline()
+        timeline.update(0)
+        self.step(timeline, 'a', 100)
+        timeline.update(5000)  # The first update after adding starts the step
+        timeline.update(5050)
+        self.assertEqual(timeline.progress, 0.5)
+
+if __name__ == '__main__':
+    unittest.main()
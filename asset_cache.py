@@ -0,0 +1,120 @@
+import hashlib
+import mmap
+import os
+import struct
+
+import pygame
+
+# On-disk cache of decoded, scaled images. The first launch decodes each
+# image, scales it and writes the raw RGBA pixels to CACHE_DIR; later launches
+# memory-map that file and wrap it with pygame.image.frombuffer(), skipping
+# the decode and the scaling. An entry is keyed on the source paths, their
+# modification times and the target size, so editing an image or changing a
+# size makes a new entry. Bump CACHE_VERSION when the file format changes.
+#
+# Every window scale gets its own card atlas, so the cache is kept under
+# MAX_CACHE_BYTES: reading a file marks it used (its modification time), and
+# after each write the least recently used files are deleted until it fits.
+
+CACHE_DIR = '.asset_cache'
+CACHE_VERSION = 1
+HEADER = struct.Struct('<4sII')  # Magic, width, height
+MAGIC = b'PRS1'
+MAX_CACHE_BYTES = 64 * 1024 * 1024  # The design-scale assets take about 18 MB
+
+def cache_path(key):
+    digest = hashlib.sha1(repr((CACHE_VERSION, key)).encode()).hexdigest()
+    return os.path.join(CACHE_DIR, f'{digest}.rgba')
+
+# Number of images in the cache (0 before the first launch, or after it was cleared)
+def cached_count():
+    try:
+        return sum(1 for name in os.listdir(CACHE_DIR) if name.endswith('.rgba'))
+    except OSError:
+        return 0
+
+# `(path, mtime)` pairs for the files a cached image is built from
+def sources(*paths):
+    return tuple((path, os.stat(path).st_mtime_ns) for path in paths)
+
+def read_cached(path):
+    try:
+        with open(path, 'rb') as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if len(data) < HEADER.size:
+        data.close()
+        return None
+    magic, width, height = HEADER.unpack_from(data)
+    if magic != MAGIC or len(data) != HEADER.size + width * height * 4:
+        data.close()
+        return None
+    # frombuffer() shares the mapped pages; convert_alpha() copies them into
+    # the display's pixel format, after which the mapping can go
+    pixels = memoryview(data)[HEADER.size:]
+    mapped = pygame.image.frombuffer(pixels, (width, height), 'RGBA')
+    image = mapped.convert_alpha()
+    del mapped
+    pixels.release()
+    data.close()
+    try:
+        os.utime(path)  # Used just now, so pruning keeps it
+    except OSError:
+        pass
+    return image
+
+def write_cached(path, image):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, *image.get_size()))
+        f.write(pygame.image.tobytes(image, 'RGBA'))
+    os.replace(temp_path, path)  # Readers never see a half-written file
+    prune(keep=path)
+
+# Delete the least recently used files until the cache fits in MAX_CACHE_BYTES
+def prune(keep=None, max_bytes=None):
+    max_bytes = MAX_CACHE_BYTES if max_bytes is None else max_bytes
+    files = []
+    for name in os.listdir(CACHE_DIR):
+        path = os.path.join(CACHE_DIR, name)
+        if name.endswith('.rgba') and path != keep:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue  # Pruned by another process
+            files.append((stat.st_mtime_ns, stat.st_size, path))
+    total = sum(size for _, size, _ in files)
+    if keep is not None:
+        total += os.path.getsize(keep)
+
+    for _, size, path in sorted(files):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        total -= size
+
+# The image for `key` from the cache, or build() it and cache the result
+def cached_image(key, build):
+    path = cache_path(key)
+    image = read_cached(path)
+    if image is None:
+        image = build()
+        try:
+            write_cached(path, image)
+        except OSError:
+            pass  # A read-only install still works, just without the cache
+    return image
+
+# pygame.image.load(path).convert_alpha(), smoothscaled to `size` if given
+def load_image(path, size=None):
+    def build():
+        image = pygame.image.load(path).convert_alpha()
+        if size is not None:
+            image = pygame.transform.smoothscale(image, size)
+        return image
+    return cached_image(('image', sources(path), size), build)
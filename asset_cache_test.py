@@ -0,0 +1,73 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import pygame
+
+import asset_cache
+
+class AssetCacheTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # convert_alpha() needs a display mode
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        pygame.display.init()
+        pygame.display.set_mode((1, 1))
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        patcher = mock.patch.object(asset_cache, 'CACHE_DIR', directory.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.builds = 0
+
+    def image(self, color=(10, 20, 30, 255), size=(8, 6)):
+        def build():
+            self.builds += 1
+            image = pygame.Surface(size, pygame.SRCALPHA)
+            image.fill(color)
+            return image
+        return build
+
+    def test_round_trip(self):
+        built = asset_cache.cached_image('key', self.image())
+        cached = asset_cache.cached_image('key', self.image())
+        self.assertEqual(self.builds, 1)
+        self.assertEqual(cached.get_size(), (8, 6))
+        self.assertEqual(pygame.image.tobytes(cached, 'RGBA'), pygame.image.tobytes(built, 'RGBA'))
+        self.assertEqual(asset_cache.cached_count(), 1)
+
+    def test_keys_get_their_own_files(self):
+        asset_cache.cached_image('one', self.image())
+        asset_cache.cached_image('two', self.image((1, 2, 3, 255)))
+        self.assertEqual(asset_cache.cached_image('two', self.image()).get_at((0, 0)), pygame.Color(1, 2, 3, 255))
+        self.assertEqual(self.builds, 2)
+
+    def test_corrupt_files_are_rebuilt(self):
+        path = asset_cache.cache_path('key')
+        for data in [b'', b'PRS1', b'XXXX' + bytes(8), asset_cache.HEADER.pack(asset_cache.MAGIC, 8, 6) + bytes(10)]:
+            os.makedirs(asset_cache.CACHE_DIR, exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(data)
+            image = asset_cache.cached_image('key', self.image())
+            self.assertEqual(image.get_at((0, 0)), pygame.Color(10, 20, 30, 255))
+            self.assertEqual(os.path.getsize(path), asset_cache.HEADER.size + 8 * 6 * 4)  # Written again
+        self.assertEqual(self.builds, 4)
+
+    def test_least_recently_used_files_are_pruned(self):
+        entry_bytes = asset_cache.HEADER.size + 8 * 6 * 4
+        with mock.patch.object(asset_cache, 'MAX_CACHE_BYTES', 3 * entry_bytes):
+            for key in range(3):
+                asset_cache.cached_image(key, self.image())
+                time.sleep(0.01)  # Distinct modification times
+            asset_cache.cached_image(0, self.image())  # Reading 0 makes 1 the oldest
+            time.sleep(0.01)
+            asset_cache.cached_image(3, self.image())
+        self.assertEqual([os.path.exists(asset_cache.cache_path(key)) for key in range(4)], [True, False, True, True])
+        self.assertEqual(self.builds, 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Loads assets on a thread pool while the main thread keeps the window alive
+# (the splash screen and its progress bar). Image decoding and scaling release
+# the GIL, so the files load in parallel. Each asset has a weight (roughly how
+# many files it reads) so the progress bar moves evenly. How long each asset
+# took is kept in `times` (seconds), for the start-up profile.
+
+class AssetLoader:
+    def __init__(self, workers=4):
+        self.pool = ThreadPoolExecutor(workers, thread_name_prefix='assets')
+        self.futures = {}
+        self.weights = {}
+        self.times = {}
+
+    # Start loading `name` by calling load(*args) on a worker
+    def add(self, name, load, *args, weight=1):
+        self.futures[name] = self.pool.submit(self.timed, name, load, *args)
+        self.weights[name] = weight
+
+    def timed(self, name, load, *args):
+        start = time.perf_counter()
+        try:
+            return load(*args)
+        finally:
+            self.times[name] = time.perf_counter() - start
+
+    # Fraction of the total weight loaded so far, from 0 to 1
+    def progress(self):
+        total = sum(self.weights.values())
+        loaded = sum(self.weights[name] for name, future in self.futures.items() if future.done())
+        return loaded / total if total else 1.0
+
+    def done(self):
+        return all(future.done() for future in self.futures.values())
+
+    # Every loaded asset by name. Waits for any still loading and re-raises
+    # the first loading error.
+    def results(self):
+        results = {name: future.result() for name, future in self.futures.items()}
+        self.pool.shutdown()
+        return results
@@ -0,0 +1,140 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import timeit
+
+import database
+from engine import GameState, deal_deck, player_order, roles
+
+# Benchmarks for the engine, the AI and the database. Record a baseline with
+#   python benchmark.py --save
+# and later runs compare against it and exit with status 1 if anything got
+# slower than the threshold allows.
+
+BASELINE_PATH = 'benchmark_baseline.json'
+
+# A game a few turns into its first round, the same every run
+def mid_round_game(turns=12):
+    game = GameState(rng=random.Random(1))
+    game.start_game()
+    for _ in range(turns):
+        game.step()
+    return game
+
+def bench_hand_order():
+    hand = mid_round_game().hands['User']
+    return lambda: list(hand)
+
+def bench_can_play_card():
+    game = mid_round_game()
+    hand = list(game.hands[game.current_player])
+    return lambda: [game.can_play_card(card) for card in hand]
+
+def bench_get_next_player():
+    game = mid_round_game()
+    return lambda: [game.get_next_player(player) for player in player_order]
+
+def bench_ai_play():
+    game = mid_round_game()
+    player = game.current_player
+    return lambda: game.choose_ai_cards(player)
+
+def bench_deal_deck():
+    rng = random.Random(1)
+    return lambda: deal_deck(rng=rng)
+
+def bench_exchange_cards():
+    game = mid_round_game()
+    game.hands = deal_deck(rng=random.Random(2))
+    game.previous_roles = dict(zip(player_order, roles))
+    return game.exchange_cards
+
+def bench_find_user():
+    database.create_user('bench_user', 'bench_password')
+    return lambda: database.find_user('bench_user', 'bench_password')
+
+def bench_create_user():
+    names = (f'bench_user_{i}' for i in range(10 ** 9))
+    return lambda: database.create_user(next(names), 'bench_password')
+
+def bench_save_game_preferences():
+    user_ids = iter(range(10 ** 9))
+    return lambda: database.save_game_preferences(next(user_ids) % 50, 5, 'Medium')
+
+BENCHMARKS = {
+    'hand_order': bench_hand_order,
+    'can_play_card': bench_can_play_card,
+    'get_next_player': bench_get_next_player,
+    'ai_play': bench_ai_play,
+    'deal_deck': bench_deal_deck,
+    'exchange_cards': bench_exchange_cards,
+    'find_user': bench_find_user,
+    'create_user': bench_create_user,
+    'save_game_preferences': bench_save_game_preferences,
+}
+
+# Best time per call in seconds over `repeat` runs of roughly 0.2s each
+def time_call(func, repeat=5):
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+def run(names, repeat=5):
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        database.connect(os.path.join(tmp, 'bench.db'))
+        try:
+            for name in names:
+                results[name] = time_call(BENCHMARKS[name](), repeat)
+        finally:
+            database.conn.close()
+    return results
+
+# Names of the benchmarks more than `threshold` slower than the baseline
+def regressions(results, baseline, threshold):
+    return [name for name, seconds in results.items()
+            if name in baseline and seconds > baseline[name] * (1 + threshold)]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the engine, AI and database hot paths.")
+    parser.add_argument('names', nargs='*', help=f"benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="baseline JSON file")
+    parser.add_argument('--save', action='store_true', help="write the results as the new baseline")
+    parser.add_argument('--threshold', type=float, default=0.25, help="allowed slowdown before failing (0.25 = 25%%)")
+    parser.add_argument('--repeat', type=int, default=5, help="timing runs per benchmark")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark: {', '.join(unknown)}")
+
+    results = run(args.names or list(BENCHMARKS), args.repeat)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+
+    for name, seconds in results.items():
+        line = f"{name:<24}{seconds * 1e6:>12.2f} us"
+        if name in baseline:
+            line += f"{(seconds / baseline[name] - 1):>+10.1%}"
+        print(line)
+
+    if args.save:
+        with open(args.baseline, 'w') as f:
+            json.dump({'python': platform.python_version(), 'results': {**baseline, **results}}, f, indent=2, sort_keys=True)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    slower = regressions(results, baseline, args.threshold)
+    if slower:
+        print(f"Slower than the baseline by more than {args.threshold:.0%}: {', '.join(slower)}")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,49 @@
+import pygame
+
+from asset_cache import cached_image, sources
+
+# Every card image packed into one surface. Faces go in a grid of card-sized
+# cells (in card order, so cell n is card n), followed by the card back, with
+# the back rotated 90 degrees on a row of its own at the bottom. Each image
+# is a subsurface of the atlas, so the renderer blits from one source surface
+# and there is one allocation instead of one per card.
+
+ATLAS_COLUMNS = 14
+BACK = 'Card_back'
+BACK_ROTATED = 'Card_back_rotated'
+
+# Rect of each image in the atlas, and the atlas size
+def atlas_layout(card_names, card_size, columns=ATLAS_COLUMNS):
+    width, height = card_size
+    rects = {}
+    for i, name in enumerate(list(card_names) + [BACK]):
+        rects[name] = pygame.Rect((i % columns) * width, (i // columns) * height, width, height)
+    rows = (len(card_names) + columns) // columns  # Faces and the back, rounded up to whole rows
+    rects[BACK_ROTATED] = pygame.Rect(0, rows * height, height, width)
+    return rects, (columns * width, rows * height + width)
+
+class CardAtlas:
+    def __init__(self, surface, rects):
+        self.surface = surface
+        self.rects = rects
+        self.images = {name: surface.subsurface(rect) for name, rect in rects.items()}
+
+    def __getitem__(self, name):
+        return self.images[name]
+
+# Load `folder`/<name>.png for every card and the back, scaling each straight
+# into its cell. The finished atlas is kept in the on-disk asset cache.
+def build_atlas(card_names, card_size, folder='Cards_png'):
+    rects, size = atlas_layout(card_names, card_size)
+    paths = {name: f'{folder}/{name}.png' for name in list(card_names) + [BACK]}
+
+    def build():
+        surface = pygame.Surface(size, pygame.SRCALPHA).convert_alpha()
+        for name, path in paths.items():
+            image = pygame.image.load(path).convert_alpha()
+            pygame.transform.smoothscale(image, card_size, surface.subsurface(rects[name]))
+        surface.blit(pygame.transform.rotate(surface.subsurface(rects[BACK]), 90), rects[BACK_ROTATED])
+        return surface
+
+    surface = cached_image(('card_atlas', sources(*paths.values()), card_size, ATLAS_COLUMNS), build)
+    return CardAtlas(surface, rects)
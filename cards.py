@@ -0,0 +1,37 @@
+# Integer card encoding. A card is an int from 0 to 53: the 52 suited cards
+# are `rank * 4 + suit`, with ranks ordered from weakest (3) to strongest (2),
+# and the two jokers are 52 and 53. Sorting the ints therefore sorts cards
+# into playing order, and rank/suit lookups are plain tuple indexing.
+
+RANK_NAMES = ['3', '4', '5', '6', '7', '8', '9', '10', 'jack', 'queen', 'king', 'ace', '2', 'joker']
+SUIT_NAMES = ['clubs', 'diamonds', 'hearts', 'spades']
+
+NUM_CARDS = 54
+NUM_RANKS = len(RANK_NAMES)
+TWO = RANK_NAMES.index('2')
+JOKER = RANK_NAMES.index('joker')
+
+THREE_OF_CLUBS = 0
+BLACK_JOKER = 52
+RED_JOKER = 53
+
+# File names in Cards_png/ (the court cards and the ace of spades have a '2' suffix)
+def _image_name(card):
+    if card == BLACK_JOKER:
+        return 'black_joker'
+    if card == RED_JOKER:
+        return 'red_joker'
+    rank, suit = RANK_NAMES[card >> 2], SUIT_NAMES[card & 3]
+    suffix = '2' if rank in ('jack', 'queen', 'king') or (rank, suit) == ('ace', 'spades') else ''
+    return f'{rank}_of_{suit}{suffix}'
+
+# Lookup tables indexed by card
+RANK = tuple(card >> 2 for card in range(NUM_CARDS))
+IS_TWO_OR_JOKER = tuple(RANK[card] >= TWO for card in range(NUM_CARDS))
+
+# Card names in the same order as the ints (their image files in Cards_png/), used by the UI and for messages
+CARD_NAMES = tuple(_image_name(card) for card in range(NUM_CARDS))
+
+# Join a few cards into a readable string for messages
+def cards_text(cards):
+    return ', '.join(CARD_NAMES[card] for card in cards)
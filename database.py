@@ -0,0 +1,265 @@
+import sqlite3
+import threading
+import hashlib
+import re  # Import the re module for regular expression
+
+# Each thread gets its own connection (see get_conn), so background threads can
+# use the database while the UI thread does too. The database is in WAL mode, so
+# readers aren't blocked by a write in progress, and with synchronous=NORMAL a
+# commit doesn't wait for the disk (a power cut can lose the last commits but
+# can't corrupt the file). A connection that finds the database locked waits up
+# to BUSY_TIMEOUT seconds instead of failing straight away. sqlite3 caches each
+# connection's prepared statements by their SQL text, so queries are fixed
+# strings with ? parameters. Rows are sqlite3.Row, indexed by column name.
+
+BUSY_TIMEOUT = 5.0  # Seconds
+
+db_path = None
+conn = None  # The connection of the thread that called connect()
+local = threading.local()
+
+def open_connection(path):
+    connection = sqlite3.connect(path, timeout=BUSY_TIMEOUT)
+    connection.row_factory = sqlite3.Row
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+# This thread's connection, opened the first time the thread uses the database
+# (and again after connect(), closing the one it had)
+def get_conn():
+    if getattr(local, 'path', None) != db_path:
+        if getattr(local, 'conn', None) is not None:
+            local.conn.close()
+        local.conn = open_connection(db_path)
+        local.path = db_path
+    return local.conn
+
+# Open the database (President.db unless told otherwise) and make sure the tables exist
+def connect(path="President.db"):
+    global conn, db_path, leaderboard_version
+    db_path = path
+    local.path = None  # Always a new connection, even if this thread had one to `path`
+    conn = get_conn()
+    with leaderboard_lock:  # Pages cached from the last database don't apply to this one
+        leaderboard_version += 1
+        leaderboard_cache.clear()
+    create_tables()
+    return conn
+
+def create_tables():
+    conn = get_conn()
+    conn.execute(''' CREATE TABLE if not exists Users (
+    user_id INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    username VARCHAR(255) UNIQUE NOT NULL,
+    password VARCHAR(255) NOT NULL,
+    guest BOOLEAN DEFAULT false,
+    sound_effects BOOLEAN DEFAULT true,
+    notifications BOOLEAN DEFAULT true,
+    created_at TIMESTAMP DEFAULT current_timestamp);''')
+
+    conn.execute('''CREATE TABLE if not exists GameSettings (
+    setting_id INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    user_id INTEGER REFERENCES Users(user_id),
+    rounds INTEGER DEFAULT 3,
+    ai_difficulty TEXT DEFAULT 'Medium');''')
+
+    conn.execute('''CREATE TABLE if not exists GameResults (
+    results_id INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    user_id INTEGER REFERENCES Users(user_id),
+    rank TEXT NOT NULL,
+    total_games INTEGER DEFAULT 0,
+    played_at TIMESTAMP DEFAULT current_timestamp);''')
+
+    conn.execute('''CREATE TABLE if not exists Leaderboard (
+    leaderboard_id INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+    user_id INTEGER REFERENCES Users(user_id),
+    total_games INTEGER REFERENCES GameResults(total_games),
+    num_Pres INTEGER DEFAULT 0,
+    num_V_Pres INTEGER DEFAULT 0,
+    num_Mid INTEGER DEFAULT 0,
+    num_V_Bum INTEGER DEFAULT 0,
+    num_Bum INTEGER DEFAULT 0);''')
+
+    # One leaderboard row per user, so record_round_results can update it in place
+    conn.execute("CREATE UNIQUE INDEX if not exists Leaderboard_user_id ON Leaderboard (user_id)")
+    # The leaderboard's order, so a page is a short walk along this index (see leaderboard_page)
+    conn.execute("CREATE INDEX if not exists Leaderboard_ranking ON Leaderboard (num_Pres DESC, num_V_Pres DESC, user_id DESC)")
+    conn.commit()
+
+# Function to hash a password using SHA-256
+def hash_password(password):
+    return hashlib.sha256(password.encode()).hexdigest()
+
+# Create a new user account
+def create_user(username, password):
+    # Check for invalid characters using a regular expression
+    if not re.match("^[A-Za-z0-9_]+$", username):
+        return "Invalid username format. Use only letters, numbers, and \nunderscores."
+    
+    conn = get_conn()
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM Users WHERE username = ?", (username,))
+    existing_user = cursor.fetchone()
+
+    if existing_user:
+        return "Username already exists. Please choose a different \n username."
+    else:
+        hashed_password = hash_password(password)
+        cursor.execute("INSERT INTO Users (username, password) VALUES (?, ?)", (username, hashed_password))
+        conn.commit()
+        return "Account created successfully."
+
+# Check if the user exists and password matches
+def find_user(username, password):
+    conn = get_conn()
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM Users WHERE username = ?", (username,))
+    user = cursor.fetchone()
+    if user and user['password'] == hash_password(password):
+        return user
+    return None
+
+# Create a new guest user (if necessary). Returns the message and the new user_id (None on failure).
+def create_guest_user(guest_name):
+    conn = get_conn()
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM Users WHERE username = ?", (guest_name,))
+    existing_user = cursor.fetchone()
+
+    if existing_user:
+        return "Guest name already exists.\n Please choose a \n different name.", None
+    else:
+        cursor.execute("INSERT INTO Users (username, password, guest) VALUES (?, ?, ?)", (guest_name, hash_password("guest_password"), True))
+        conn.commit()
+        return f"Guest user {guest_name} \n created successfully.", cursor.lastrowid
+
+# Function to update the password for the forgot password feature
+def update_password(username, new_password):
+    conn = get_conn()
+    cursor = conn.cursor()
+    # Retrieve the current password for the user
+    cursor.execute("SELECT password FROM Users WHERE username = ?", (username,))
+    existing_user = cursor.fetchone()
+    
+    if existing_user:
+        current_password = existing_user["password"]
+        hashed_new_password = hash_password(new_password)
+        
+        # Check if the new password is the same as the current one
+        if current_password == hashed_new_password:
+            return "Password is the same as before. Please choose a \n different password."
+        
+        # Check password length
+        if len(new_password) < 8:
+            return "Password is too short. It must be at least 8 \n characters long."
+        
+        # Update the password in the database
+        cursor.execute("UPDATE Users SET password = ? WHERE username = ?", (hashed_new_password, username))
+        conn.commit()
+        return "Password updated successfully. Please log in."
+    else:
+        return "Username not found."
+
+# Function to save game preferences to the GameSettings table
+def save_game_preferences(user_id, rounds, ai_difficulty):
+    conn = get_conn()
+    cursor = conn.cursor()
+
+    # Check if the user already has game settings
+    cursor.execute("SELECT * FROM GameSettings WHERE user_id = ?", (user_id,))
+    existing_settings = cursor.fetchone()
+
+    if existing_settings:
+        cursor.execute("""
+            UPDATE GameSettings
+            SET rounds = ?, ai_difficulty = ?
+            WHERE user_id = ?
+        """, (rounds, ai_difficulty, user_id))
+    else:
+        cursor.execute("""
+            INSERT INTO GameSettings (user_id, rounds, ai_difficulty)
+            VALUES (?, ?, ?)
+        """, (user_id, rounds, ai_difficulty))
+
+    conn.commit()
+    return "Game preferences saved successfully."
+
+# The Leaderboard counter for each rank
+RANK_COLUMNS = {
+    'President': 'num_Pres',
+    'Vice President': 'num_V_Pres',
+    'Middle': 'num_Mid',
+    'Vice Bum': 'num_V_Bum',
+    'Bum': 'num_Bum',
+}
+
+# Record finished rounds: `results` is a list of (user_id, rank) pairs. Each one
+# is a row in GameResults and one more round in the user's Leaderboard counters,
+# all in one transaction.
+def record_round_results(results):
+    global leaderboard_version
+    counts = {}
+    for user_id, rank in results:
+        row = counts.setdefault(user_id, [0] * (len(RANK_COLUMNS) + 1))
+        row[0] += 1
+        row[1 + list(RANK_COLUMNS).index(rank)] += 1
+
+    columns = ', '.join(RANK_COLUMNS.values())
+    updates = ', '.join(f"{column} = {column} + excluded.{column}" for column in RANK_COLUMNS.values())
+    conn = get_conn()
+    with conn:
+        conn.executemany("INSERT INTO GameResults (user_id, rank) VALUES (?, ?)", results)
+        conn.executemany(f"""
+            INSERT INTO Leaderboard (user_id, total_games, {columns})
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (user_id) DO UPDATE
+            SET total_games = total_games + excluded.total_games, {updates}
+        """, [(user_id, *row) for user_id, row in counts.items()])
+    with leaderboard_lock:
+        leaderboard_version += 1
+        leaderboard_cache.clear()
+
+# The leaderboard ranks users by times President, then times Vice President,
+# with later accounts first on a tie. Pages are fetched by keyset: each page
+# starts after the ranking key of the last row on the page before, so any page
+# costs the same however far down it is. Pages are cached until the next
+# record_round_results(); leaderboard_version lets a read that raced with a
+# write skip caching what it read. The writer thread bumps the version and
+# clears the cache under leaderboard_lock, and a read checks the version and
+# stores its page under it too, so a stale page can't be stored after a clear.
+LEADERBOARD_QUERY = """
+    SELECT Leaderboard.user_id, username, total_games, num_Pres, num_V_Pres, num_Mid, num_V_Bum, num_Bum
+    FROM Leaderboard JOIN Users ON Users.user_id = Leaderboard.user_id
+    {where}
+    ORDER BY num_Pres DESC, num_V_Pres DESC, Leaderboard.user_id DESC
+    LIMIT ?
+"""
+LEADERBOARD_TOP = LEADERBOARD_QUERY.format(where="")
+LEADERBOARD_AFTER = LEADERBOARD_QUERY.format(where="WHERE (num_Pres, num_V_Pres, Leaderboard.user_id) < (?, ?, ?)")
+
+leaderboard_cache = {}
+leaderboard_version = 0
+leaderboard_lock = threading.Lock()
+
+# Where `row` is in the leaderboard's order, for leaderboard_page(after=...)
+def leaderboard_key(row):
+    return (row['num_Pres'], row['num_V_Pres'], row['user_id'])
+
+# Up to `limit` leaderboard rows, best first, starting after the row whose key is `after` (None for the top)
+def leaderboard_page(after=None, limit=10):
+    key = (after, limit)
+    page = leaderboard_cache.get(key)
+    if page is not None:
+        return page
+
+    version = leaderboard_version
+    conn = get_conn()
+    if after is None:
+        page = conn.execute(LEADERBOARD_TOP, (limit,)).fetchall()
+    else:
+        page = conn.execute(LEADERBOARD_AFTER, (*after, limit)).fetchall()
+    with leaderboard_lock:
+        if version == leaderboard_version:
+            leaderboard_cache[key] = page
+    return page
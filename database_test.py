@@ -0,0 +1,52 @@
+import os
+import random
+import tempfile
+import unittest
+
+import database
+
+class LeaderboardTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        database.connect(os.path.join(self.directory.name, 'test.db'))
+        conn = database.get_conn()
+        rng = random.Random(8)
+        results = []
+        for i in range(25):
+            user_id = conn.execute("INSERT INTO Users (username, password) VALUES (?, ?)", (f'user{i}', 'x')).lastrowid
+            results.extend((user_id, rng.choice(['President', 'Vice President', 'Bum'])) for _ in range(rng.randint(1, 4)))
+        conn.commit()
+        database.record_round_results(results)
+
+    def tearDown(self):
+        database.get_conn().close()
+        self.directory.cleanup()
+
+    def all_rows(self):
+        rows = database.get_conn().execute("SELECT * FROM Leaderboard").fetchall()
+        return sorted(rows, key=lambda row: (-row['num_Pres'], -row['num_V_Pres'], -row['user_id']))
+
+    def test_pages_cover_the_ranking_in_order(self):
+        rows, after = [], None
+        while True:
+            page = database.leaderboard_page(after, limit=4)
+            if not page:
+                break
+            self.assertLessEqual(len(page), 4)
+            rows.extend(page)
+            after = database.leaderboard_key(page[-1])
+        self.assertEqual([row['user_id'] for row in rows], [row['user_id'] for row in self.all_rows()])
+
+    def test_recording_results_refreshes_pages(self):
+        top = database.leaderboard_page(limit=1)[0]
+        last = self.all_rows()[-1]['user_id']
+        database.record_round_results([(last, 'President')] * (top['num_Pres'] + 1))
+        self.assertEqual(database.leaderboard_page(limit=1)[0]['user_id'], last)
+
+    def test_connecting_to_another_database_drops_cached_pages(self):
+        self.assertTrue(database.leaderboard_page())
+        database.connect(os.path.join(self.directory.name, 'other.db'))
+        self.assertEqual(database.leaderboard_page(), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+# Dirty-rectangle rendering for the game table. The table is split into
+# regions (each seat's fan, the centre pile, the button, the message line).
+# Each region has a rect, a function that draws it and a function that returns
+# whatever it depends on. render() redraws only the regions whose state changed
+# since they were last drawn, plus any region overlapping one of those, and
+# returns the rects to pass to pygame.display.update().
+
+class Region:
+    __slots__ = ('name', 'rect', 'draw', 'state')
+
+    def __init__(self, name, rect, draw, state):
+        self.name = name
+        self.rect = rect
+        self.draw = draw
+        self.state = state
+
+class DirtyRegions:
+    def __init__(self, background, enabled=True):
+        self.background = background
+        self.enabled = enabled  # False redraws everything every time
+        self.regions = []  # Drawn in this order
+        self.drawn = {}  # Region name -> state it was last drawn with
+        self.damaged = []  # Rects something else drew over
+        self.full = True
+
+    def add(self, name, rect, draw, state):
+        self.regions.append(Region(name, rect, draw, state))
+
+    # Everything has to be redrawn, e.g. after an overlay covered the screen
+    def invalidate(self):
+        self.full = True
+
+    # Something outside the regions (an animated card) drew over `rect`
+    def damage(self, rect):
+        self.damaged.append(rect)
+
+    def render(self, surface):
+        states = {region.name: region.state() for region in self.regions}
+
+        if self.full or not self.enabled:
+            surface.blit(self.background, (0, 0))
+            for region in self.regions:
+                self._draw(surface, region)
+            self.drawn = states
+            self.damaged = []
+            self.full = False
+            return [surface.get_rect()]
+
+        dirty_rects = list(self.damaged)
+        dirty = []
+        for region in self.regions:
+            if states[region.name] != self.drawn.get(region.name):
+                dirty.append(region)
+                dirty_rects.append(region.rect)
+        if not dirty_rects:
+            return []
+
+        # A region overlapping a redrawn area has to be redrawn as well
+        grown = True
+        while grown:
+            grown = False
+            for region in self.regions:
+                if region not in dirty and region.rect.collidelist(dirty_rects) != -1:
+                    dirty.append(region)
+                    dirty_rects.append(region.rect)
+                    grown = True
+
+        for rect in dirty_rects:
+            surface.blit(self.background, rect, rect)
+        for region in self.regions:
+            if region in dirty:
+                self._draw(surface, region)
+                self.drawn[region.name] = states[region.name]
+        self.damaged = []
+        return dirty_rects
+
+    def _draw(self, surface, region):
+        # Clip so a region can never leave pixels behind outside its own rect
+        surface.set_clip(region.rect)
+        region.draw()
+        surface.set_clip(None)
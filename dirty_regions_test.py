@@ -0,0 +1,83 @@
+import unittest
+
+import pygame
+
+from dirty_regions import DirtyRegions
+
+class DirtyRegionsTest(unittest.TestCase):
+    def setUp(self):
+        self.surface = pygame.Surface((300, 100))
+        self.background = pygame.Surface((300, 100))
+        self.background.fill((0, 128, 0))
+        self.state = {'a': 0, 'b': 0, 'c': 0}
+        self.drawn = []
+
+    def regions(self, enabled=True):
+        regions = DirtyRegions(self.background, enabled)
+        # a and b overlap; c is on its own
+        for name, rect in [('a', (0, 0, 100, 100)), ('b', (80, 0, 100, 100)), ('c', (200, 0, 100, 100))]:
+            regions.add(name, pygame.Rect(rect), lambda name=name: self.draw(name), lambda name=name: self.state[name])
+        return regions
+
+    def draw(self, name):
+        self.drawn.append(name)
+        self.surface.fill((255, 0, 0))  # Clipped to the region's rect
+
+    def render(self, regions):
+        self.drawn = []
+        return regions.render(self.surface)
+
+    def test_first_render_draws_everything(self):
+        regions = self.regions()
+        self.assertEqual(self.render(regions), [self.surface.get_rect()])
+        self.assertEqual(self.drawn, ['a', 'b', 'c'])
+        self.assertEqual(self.render(regions), [])
+        self.assertEqual(self.drawn, [])
+
+    def test_only_changed_regions_are_redrawn(self):
+        regions = self.regions()
+        self.render(regions)
+        self.state['c'] = 1
+        self.assertEqual(self.render(regions), [pygame.Rect(200, 0, 100, 100)])
+        self.assertEqual(self.drawn, ['c'])
+
+    def test_overlapping_regions_are_redrawn_too(self):
+        regions = self.regions()
+        self.render(regions)
+        self.state['a'] = 1
+        rects = self.render(regions)
+        self.assertEqual(self.drawn, ['a', 'b'])
+        self.assertEqual(sorted(map(tuple, rects)), [(0, 0, 100, 100), (80, 0, 100, 100)])
+
+    def test_damage_redraws_what_it_covers(self):
+        regions = self.regions()
+        self.render(regions)
+        self.surface.fill((0, 0, 255), (170, 10, 40, 20))  # Something drew across b and c
+        regions.damage(pygame.Rect(170, 10, 40, 20))
+        self.render(regions)
+        self.assertEqual(self.drawn, ['a', 'b', 'c'])  # b pulls in a, which it overlaps
+        self.assertEqual(self.surface.get_at((190, 15)), pygame.Color(0, 128, 0))  # Background restored between b and c
+
+    def test_drawing_is_clipped_to_the_region(self):
+        regions = self.regions()
+        self.render(regions)
+        self.state['c'] = 1
+        self.surface.fill((0, 0, 0))
+        self.render(regions)
+        self.assertEqual(self.surface.get_at((250, 50)), pygame.Color(255, 0, 0))
+        self.assertEqual(self.surface.get_at((190, 50)), pygame.Color(0, 0, 0))
+
+    def test_invalidate_and_disabled_redraw_everything(self):
+        regions = self.regions()
+        self.render(regions)
+        regions.invalidate()
+        self.render(regions)
+        self.assertEqual(self.drawn, ['a', 'b', 'c'])
+
+        regions = self.regions(enabled=False)
+        self.render(regions)
+        self.render(regions)
+        self.assertEqual(self.drawn, ['a', 'b', 'c'])
+
+if __name__ == '__main__':
+    unittest.main()
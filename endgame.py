@@ -0,0 +1,151 @@
+import time
+from collections import OrderedDict
+
+from cards import NUM_RANKS, RANK, TWO
+from engine import player_order, roles
+
+# Exact endgame solver. Once only a few seats still hold cards the AI can
+# search every line of play to the end of the round. Each seat tries to finish
+# as high as it can (max^n), and the results are kept in a bounded LRU table.
+#
+# Suits never matter once the 3 of clubs is down, so a position is hashed by
+# rank counts alone: each hand is packed into an int with 3 bits per rank, and
+# the seats are listed starting with the one to move. That makes the key
+# independent of seat names, so the same position in a later round is a cache hit.
+
+PASS = -1
+FREE = -1  # Pile value when the next player may lead anything
+CLOCK_CHECK = 256  # New positions searched between looks at the deadline
+
+# The table is sized from a memory budget. Every Hard AI search worker imports
+# its own solver, so this is per process.
+TABLE_BYTES = 16 * 1024 * 1024
+ENTRY_BYTES = 400  # Measured: the key and result tuples plus the OrderedDict's share
+
+class SearchLimit(Exception):
+    pass
+
+class EndgameSolver:
+    def __init__(self, max_entries=TABLE_BYTES // ENTRY_BYTES, node_limit=20000):
+        self.max_entries = max_entries
+        self.node_limit = node_limit  # New positions one solve() may search
+        self.table = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._budget = 0
+        self._deadline = None
+
+    # `hands` are packed rank counts, the player to move first; `top` and `size`
+    # describe the play on the pile. Returns the best move for that player (a
+    # (rank, count) pair, or PASS) and the finishing place of each seat, 0 being
+    # the first of them to go out. Raises SearchLimit if the position needs more
+    # than node_limit new positions, or if time.perf_counter() passes `deadline`.
+    def solve(self, hands, top=FREE, size=0, passes=0, deadline=None):
+        self._budget = self.node_limit
+        self._deadline = deadline
+        return self._solve(tuple(hands), top, size, passes)
+
+    # The table lookup and store are inlined rather than going through an
+    # LRUCache: this runs once per position and is the hottest loop in the AI
+    def _solve(self, hands, top, size, passes):
+        key = (hands, top, size, passes)
+        entry = self.table.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.table.move_to_end(key)
+            return entry
+
+        self.misses += 1
+        self._budget -= 1
+        if self._budget < 0:
+            raise SearchLimit()
+        if self._deadline is not None and self._budget % CLOCK_CHECK == 0 and time.perf_counter() > self._deadline:
+            raise SearchLimit()
+
+        n = len(hands)
+        mine = hands[0]
+        best_places = None
+        best_move = None
+
+        # Strongest plays first; 2s and jokers go in any number on anything
+        moves = [] if top == FREE else [PASS]
+        for rank in range(NUM_RANKS - 1, max(top, 0) - 1, -1):
+            count = (mine >> (3 * rank)) & 7
+            if top == FREE or rank >= TWO:
+                moves.extend((rank, k) for k in range(count, 0, -1))
+            elif count >= size:
+                moves.append((rank, size))
+
+        for move in moves:
+            if move == PASS:
+                passes_now = passes + 1
+                # Everyone else has passed: the next player leads anything
+                if passes_now >= n - 1:
+                    result = self._solve(hands[1:] + hands[:1], FREE, 0, 0)[1]
+                else:
+                    result = self._solve(hands[1:] + hands[:1], top, size, passes_now)[1]
+                places = result[-1:] + result[:-1]
+            else:
+                rank, count = move
+                left = mine - (count << (3 * rank))
+                if not left:
+                    # Out of cards: first of the remaining seats to finish
+                    if n == 2:
+                        places = (0, 1)
+                    else:
+                        places = (0,) + tuple(place + 1 for place in self._solve(hands[1:], FREE, 0, 0)[1])
+                elif rank >= TWO:
+                    # Same player again after a 2 or joker
+                    places = self._solve((left,) + hands[1:], FREE, 0, 0)[1]
+                else:
+                    result = self._solve(hands[1:] + (left,), rank, count, 0)[1]
+                    places = result[-1:] + result[:-1]
+
+            if best_places is None or places[0] < best_places[0]:
+                best_places = places
+                best_move = move
+                if places[0] == 0:
+                    break  # Can't do better than going out first
+
+        entry = (best_move, best_places)
+        self.table[key] = entry
+        if len(self.table) > self.max_entries:
+            self.table.popitem(last=False)
+        return entry
+
+# Shared between games so positions seen in earlier rounds stay cached
+solver = EndgameSolver()
+
+# Seats still holding cards, in turn order starting with the player to move
+def seats_to_move(game):
+    seats = [player for player in player_order if player in game.player_order]
+    start = seats.index(game.current_player)
+    return seats[start:] + seats[:start]
+
+def _solve_game(game, deadline):
+    seats = seats_to_move(game)
+    hands = [game.hands[player].packed for player in seats]
+    if game.is_free_lead():
+        move, places = solver.solve(hands, deadline=deadline)
+    else:
+        move, places = solver.solve(hands, RANK[game.played_cards[-1]], game.last_play_size, game.pass_count, deadline)
+    return seats, move, places
+
+# Best play for the player to move in a fully known position, None to pass.
+# Raises SearchLimit if the position is too big to solve (by `deadline`, if given).
+def best_cards(game, deadline=None):
+    _, move, _ = _solve_game(game, deadline)
+    if move == PASS:
+        return None
+    return game.hands[game.current_player].cards_of_rank(*move)
+
+# Role every seat ends the round with under perfect play, or None if too big to solve (by `deadline`)
+def final_roles(game, deadline=None):
+    try:
+        seats, _, places = _solve_game(game, deadline)
+    except SearchLimit:
+        return None
+    finished = dict(game.player_roles)
+    for player, place in zip(seats, places):
+        finished[player] = roles[len(game.player_roles) + place]
+    return finished
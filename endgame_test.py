@@ -0,0 +1,67 @@
+import random
+import time
+import unittest
+
+import endgame
+from cards import NUM_CARDS, RANK
+from engine import player_order, roles
+from engine_test import position
+
+# Every seat's role at the end of the round under max^n play, worked out by
+# playing every legal move on the engine itself. Moves are tried in the
+# solver's order (pass, then the strongest play first) and the first one that
+# gets the mover their best place wins, so ties go the same way as in the solver.
+def engine_roles(game):
+    if game.round_over:
+        return dict(game.player_roles)
+    player = game.current_player
+    moves = sorted(game.legal_moves(player), key=lambda move: (move is not None, -RANK[move[0]] if move else 0,
+                                                               -len(move) if move else 0))
+    best = None
+    for move in moves:
+        after = game.clone()
+        after.play_move(player, move)
+        result = engine_roles(after)
+        if best is None or roles.index(result[player]) < roles.index(best[player]):
+            best = result
+            if result[player] == roles[len(game.player_roles)]:
+                break
+    return best
+
+class EndgameTest(unittest.TestCase):
+    def test_solver_matches_the_engine(self):
+        rng = random.Random(7)
+        for _ in range(400):
+            seats = rng.sample(player_order, rng.choice([2, 3]))
+            deck = rng.sample(range(1, NUM_CARDS), 4 * len(seats) + 4)
+            most = 6 - len(seats)  # Few enough cards for the engine to play out every line
+            hands = {seat: deck[4 * i:4 * i + rng.randint(1, most)] for i, seat in enumerate(seats)}
+            pile, passes = [], 0
+            if rng.random() < 0.6:
+                size = rng.randint(1, 2)
+                pile = deck[-size:] if len({RANK[c] for c in deck[-size:]}) == 1 else deck[-1:]
+                passes = rng.randrange(len(seats) - 1)
+            finished = [seat for seat in player_order if seat not in seats]
+            game = position(hands, seats[0], pile, passes, finished)
+
+            expected = engine_roles(game.clone())
+            self.assertEqual(endgame.final_roles(game), expected)
+
+            cards = endgame.best_cards(game)
+            if cards is None:
+                self.assertIn(None, game.legal_moves(game.current_player))
+            else:
+                self.assertTrue(game.clone().play_cards(game.current_player, cards))
+
+    def test_solver_gives_up_past_its_node_limit(self):
+        solver = endgame.EndgameSolver(node_limit=10)
+        with self.assertRaises(endgame.SearchLimit):
+            solver.solve([0o1111111, 0o2222222, 0o1010101])
+
+    def test_solver_stops_at_the_deadline(self):
+        solver = endgame.EndgameSolver(node_limit=10 ** 9)
+        with self.assertRaises(endgame.SearchLimit):
+            solver.solve([0o1111111111, 0o2222222222, 0o1212121212], deadline=time.perf_counter())
+
+if __name__ == '__main__':
+    unittest.main()
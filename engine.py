@@ -0,0 +1,367 @@
+import random
+
+from cards import CARD_NAMES, IS_TWO_OR_JOKER, RANK, THREE_OF_CLUBS, TWO, cards_text
+from hand import Hand
+
+# Headless rules engine for President. Nothing in here touches pygame or the
+# database, so it can be imported by tools and stepped as fast as Python allows.
+#
+# A play is one to four cards of the same rank. Whoever leads sets how many
+# cards the next plays must have, and each must be of the same rank or higher.
+# 2s and jokers can be played on anything, in any number, and the same player
+# goes again.
+
+roles = ['President', 'Vice President', 'Middle', 'Vice Bum', 'Bum']
+
+# Seats in the order turns are taken around the table
+player_order = ['User', 'Player 3', 'Player 1', 'Player 2', 'Player 4']
+
+def shuffle_deck(rng=random):
+    shuffled_deck = list(range(len(CARD_NAMES)))
+    rng.shuffle(shuffled_deck)  # Shuffle the list in place
+    return shuffled_deck
+
+def deal_deck(num_players=5, rng=random):
+    shuffled_deck = shuffle_deck(rng)
+    hands = {f'Player {i+1}': [] for i in range(num_players - 1)}
+    hands['User'] = []  # Add the User to the hands dictionary
+
+    for i, card in enumerate(shuffled_deck):
+        player = f'Player {i % (num_players - 1) + 1}' if i % num_players != 0 else 'User'
+        hands[player].append(card)
+
+    return {player: Hand.from_cards(cards) for player, cards in hands.items()}
+
+class GameState:
+    # All the state that used to live in President.py globals. The methods only
+    # change this object and record what happened in `events`; drawing, sounds
+    # and waiting are left to whoever is driving the game.
+
+    def __init__(self, rounds=5, num_players=5, rng=None, difficulty='Medium', ai_budget_ms=500, ai_workers=1):
+        self.rounds = rounds
+        self.num_players = num_players
+        self.rng = rng if rng is not None else random.Random()
+        self.difficulty = difficulty
+        self.ai_budget_ms = ai_budget_ms  # Thinking time per move for the Hard AI
+        self.ai_workers = ai_workers  # Processes the Hard AI searches with
+        self.hands = None
+        self.played_cards = []
+        self.last_play_size = 0  # Number of cards in the play on top of the pile
+        self.pass_count = 0
+        self.player_order = list(player_order)
+        self.player_roles = {}
+        self.previous_roles = {}
+        self.current_player = None
+        self.three_of_clubs_played = False
+        self.last_player_finished = False
+        self.rounds_played = 0
+        self.round_over = False
+        self.game_over = False
+        self.message = ''
+        self.events = []
+
+    # Copy of the game that can be played forward without touching this one.
+    # The random generator is shared, so clones shouldn't deal new rounds.
+    def clone(self):
+        other = GameState.__new__(GameState)
+        other.__dict__.update(self.__dict__)
+        other.hands = {player: hand.copy() for player, hand in self.hands.items()}
+        other.played_cards = list(self.played_cards)
+        other.player_order = list(self.player_order)
+        other.player_roles = dict(self.player_roles)
+        other.previous_roles = dict(self.previous_roles)
+        other.events = []
+        return other
+
+    # Hand the events recorded since the last call to the caller
+    def drain_events(self):
+        events = self.events
+        self.events = []
+        return events
+
+    def set_message(self, message):
+        self.message = message
+
+    def player_with_three_of_clubs(self):
+        for player, cards in self.hands.items():
+            if THREE_OF_CLUBS in cards:
+                return player
+        return None
+
+    # True when the next card does not have to beat the top of the pile
+    def is_free_lead(self):
+        return (not self.played_cards or self.last_player_finished
+                or self.pass_count >= len(self.player_order) - 1
+                or IS_TWO_OR_JOKER[self.played_cards[-1]])
+
+    def can_play_card(self, card):
+        return self.can_play_cards((card,))
+
+    def can_play_cards(self, cards):
+        if not cards:
+            return False
+
+        # All the cards in a play must be the same rank
+        rank = RANK[cards[0]]
+        for card in cards:
+            if RANK[card] != rank:
+                return False
+
+        # Jokers and 2s can be played on anything
+        if self.is_free_lead() or rank >= TWO:
+            return True
+
+        # Allow the same number of cards of the same rank or higher
+        return len(cards) == self.last_play_size and rank >= RANK[self.played_cards[-1]]
+
+    def get_next_player(self, current_player):
+        # If current player is None, start with the first valid player
+        if current_player is None:
+            for player in player_order:
+                if player in self.player_order and self.hands[player]:
+                    return player
+            return None
+
+        current_index = player_order.index(current_player)
+
+        # Walk round the table once, starting after the current player
+        for i in range(1, len(player_order) + 1):
+            next_player = player_order[(current_index + i) % len(player_order)]
+            if next_player in self.player_order and self.hands[next_player]:
+                return next_player
+        return None
+
+    def assign_rank(self, player):
+        # Check if the player already has a role assigned
+        if player in self.player_roles:
+            return self.player_roles[player]
+
+        rank = roles[min(len(self.player_roles), len(roles) - 1)]
+        self.player_roles[player] = rank
+        self.events.append(('rank', player, rank))
+        return rank
+
+    def play_card(self, player, card):
+        return self.play_cards(player, (card,))
+
+    # Play one or more cards of the same rank for `player`. Returns False if the move is illegal.
+    def play_cards(self, player, cards):
+        hand = self.hands[player]
+        if player != self.current_player or len(set(cards)) != len(cards) or not self.can_play_cards(cards):
+            return False
+        for card in cards:
+            if card not in hand:
+                return False
+
+        for card in cards:
+            hand.remove(card)
+        self.played_cards.extend(cards)
+        self.last_play_size = len(cards)
+        self.pass_count = 0
+        self.last_player_finished = False
+        self.events.append(('play', player, cards))
+
+        if not hand:
+            self.set_message(f"{player} played {cards_text(cards)}!")
+            self.finish_player(player)
+        elif IS_TWO_OR_JOKER[cards[0]]:
+            # Don't change turns after a 2 or joker - same player goes again
+            self.set_message(f"{player} played {cards_text(cards)}. {player}'s turn again!")
+        else:
+            self.current_player = self.get_next_player(player)
+            self.set_message(f"{player} played {cards_text(cards)}. {self.current_player}'s turn.")
+        return True
+
+    # Pass for `player`. Returns False if it isn't their turn or they're leading, which
+    # can't be passed (legal_moves() and the endgame solver leave the pass out too).
+    def pass_turn(self, player):
+        if player != self.current_player or self.is_free_lead():
+            return False
+
+        self.pass_count += 1
+        self.events.append(('pass', player))
+        self.current_player = self.get_next_player(player)
+        if self.pass_count >= len(self.player_order) - 1:
+            self.set_message(f"All players passed. {self.current_player} can play any card.")
+        else:
+            self.set_message(f"{player} passed. {self.current_player}'s turn.")
+        return True
+
+    # Called when `player` has just played their last card
+    def finish_player(self, player):
+        self.assign_rank(player)
+        self.last_player_finished = True
+        if player in self.player_order:
+            self.player_order.remove(player)
+
+        if len(self.player_order) == 1:
+            self.assign_rank(self.player_order[0])
+            self.end_round()
+        else:
+            self.current_player = self.get_next_player(player)
+            self.set_message(f"{self.current_player}'s turn. Play any card.")
+
+    def end_round(self):
+        self.round_over = True
+        self.previous_roles = dict(self.player_roles)
+        self.rounds_played += 1
+        self.events.append(('round_over', self.rounds_played))
+
+        if self.rounds_played >= self.rounds:
+            self.game_over = True
+            self.current_player = None
+            self.set_message("")  # Clear the message at the end of the game
+        else:
+            self.start_new_round()
+
+    def exchange_cards(self):
+        by_role = {role: player for player, role in self.previous_roles.items()}
+        president = by_role['President']
+        vice_president = by_role['Vice President']
+        vice_bum = by_role['Vice Bum']
+        bum = by_role['Bum']
+
+        # President gives their two worst cards to Bum, Bum gives their two best to President
+        worst_cards = self.hands[president].worst(2)
+        best_cards = self.hands[bum].best(2)
+        self._move_cards(president, bum, worst_cards)
+        self._move_cards(bum, president, best_cards)
+
+        # Vice President and Vice Bum swap one card the same way
+        worst_card = self.hands[vice_president].worst(1)
+        best_card = self.hands[vice_bum].best(1)
+        self._move_cards(vice_president, vice_bum, worst_card)
+        self._move_cards(vice_bum, vice_president, best_card)
+
+        self.events.append(('exchange', president, bum, worst_cards, best_cards))
+        self.events.append(('exchange', vice_president, vice_bum, worst_card, best_card))
+        self.set_message(f"{president} gave {cards_text(worst_cards)} to {bum}. {bum} gave {cards_text(best_cards)} to {president}. {vice_president} gave {cards_text(worst_card)} to {vice_bum}. {vice_bum} gave {cards_text(best_card)} to {vice_president}.")
+
+    def _move_cards(self, giver, receiver, cards):
+        for card in cards:
+            self.hands[giver].remove(card)
+            self.hands[receiver].add(card)
+
+    def start_new_round(self):
+        self.hands = deal_deck(self.num_players, self.rng)
+
+        # Reset round state
+        self.played_cards = []
+        self.last_play_size = 0
+        self.pass_count = 0
+        self.player_order = list(player_order)
+        self.player_roles = {}
+        self.three_of_clubs_played = False
+        self.last_player_finished = False
+        self.round_over = False
+
+        # After the first round the cards are exchanged and the Bum starts
+        if self.previous_roles:
+            self.exchange_cards()
+            self.current_player = next(player for player, role in self.previous_roles.items() if role == 'Bum')
+        else:
+            self.current_player = self.player_with_three_of_clubs() or player_order[0]
+
+        self.set_message(f"Round {self.rounds_played + 1} started! {self.current_player}'s turn.")
+
+        # If starting player has 3 of clubs, play it automatically
+        if THREE_OF_CLUBS in self.hands[self.current_player]:
+            self.play_three_of_clubs()
+
+    def play_three_of_clubs(self):
+        player = self.current_player
+        self.hands[player].remove(THREE_OF_CLUBS)
+        self.played_cards.append(THREE_OF_CLUBS)
+        self.last_play_size = 1
+        self.three_of_clubs_played = True
+        self.events.append(('three_of_clubs', player))
+        self.current_player = self.get_next_player(player)
+        self.set_message(f"{self.current_player}'s turn.")
+
+    def start_game(self):
+        self.rounds_played = 0
+        self.previous_roles = {}
+        self.game_over = False
+        self.events = []
+        self.start_new_round()
+
+    # Every play `player` could make now as tuples of cards, plus None for passing
+    # when they aren't leading. Suits don't matter, so there is one play per rank
+    # and size, read straight off the hand's rank index rather than from subsets.
+    def legal_moves(self, player):
+        hand = self.hands[player]
+        if self.is_free_lead():
+            moves = []
+            wild_from = 0  # Any rank, any number of cards
+        else:
+            moves = [None]
+            wild_from = TWO
+            size = self.last_play_size
+            for rank in hand.ranks(RANK[self.played_cards[-1]], size):
+                if rank < TWO:
+                    moves.append(hand.cards_of_rank(rank, size))
+
+        for rank in hand.ranks(wild_from):
+            for n in range(1, hand.counts[rank] + 1):
+                moves.append(hand.cards_of_rank(rank, n))
+        return moves
+
+    # Pick the cards the Medium AI would play, or None to pass
+    def choose_ai_cards(self, player):
+        hand = self.hands[player]
+        if not hand:
+            return None
+        if self.is_free_lead():
+            # Lead every card of the lowest rank
+            rank = RANK[hand.lowest()]
+            return hand.cards_of_rank(rank, hand.counts[rank])
+
+        # Lowest rank at or above the pile with enough cards, else a single 2 or joker
+        size = self.last_play_size
+        rank = hand.lowest_set(size, RANK[self.played_cards[-1]])
+        if rank is not None:
+            return hand.cards_of_rank(rank, size)
+        wild = hand.lowest_at_least(TWO)
+        return (wild,) if wild is not None else None
+
+    # Easy AI: any legal play at random, never passing when it has one
+    def choose_easy_cards(self, player):
+        moves = [move for move in self.legal_moves(player) if move is not None]
+        return self.rng.choice(moves) if moves else None
+
+    # The cards the AI plays for `player` at this difficulty, or None to pass.
+    # Only reads the game (apart from drawing from its random generator), so the
+    # UI can work it out on another thread and play it with play_move().
+    def choose_move(self, player):
+        if self.difficulty == 'Hard':
+            from mcts import choose_cards
+            return choose_cards(self, player, self.ai_budget_ms, self.ai_workers)
+        if self.difficulty == 'Easy':
+            return self.choose_easy_cards(player)
+        return self.choose_ai_cards(player)
+
+    # Play `cards` for `player`, or pass if `cards` is None
+    def play_move(self, player, cards):
+        if cards is None:
+            return self.pass_turn(player)
+        return self.play_cards(player, cards)
+
+    # Take one AI turn for `player`. Returns False if it isn't their turn.
+    def ai_play(self, player):
+        if player != self.current_player or self.game_over:
+            return False
+        return self.play_move(player, self.choose_move(player))
+
+    # Let the AI take the current player's turn, whoever is sitting there
+    def step(self):
+        if self.game_over or self.current_player is None:
+            return False
+        return self.ai_play(self.current_player)
+
+    # Play until all the rounds are finished with every seat driven by the AI
+    def play_game(self):
+        if self.hands is None:
+            self.start_game()
+        while self.step():
+            pass
+        return self.previous_roles
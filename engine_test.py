@@ -0,0 +1,178 @@
+import random
+import unittest
+
+from cards import BLACK_JOKER, NUM_CARDS, NUM_RANKS, RANK, THREE_OF_CLUBS, TWO
+from engine import GameState, deal_deck, player_order, roles
+from hand import Hand
+
+# Tests for the rules engine. Each module's tests are in <module>_test.py; run
+# them all with
+#   python -m unittest discover -v -p "*test.py"
+
+def card(rank, suit=0):
+    return rank * 4 + suit
+
+# A game part way through a round: `hands` maps the seats still playing to their
+# cards, `finished` lists the seats already out (in the order they went out) and
+# `pile` is the play on top of the pile (empty for a free lead).
+def position(hands, current, pile=(), passes=0, finished=(), rounds=1):
+    game = GameState(rounds, rng=random.Random(0))
+    game.hands = {player: Hand() for player in player_order}
+    for player, cards in hands.items():
+        game.hands[player] = Hand(cards)
+    game.player_order = [player for player in player_order if player in hands]
+    for player in finished:
+        game.player_roles[player] = roles[len(game.player_roles)]
+    game.current_player = current
+    game.played_cards = list(pile)
+    game.last_play_size = len(pile)
+    game.pass_count = passes
+    game.three_of_clubs_played = True
+    return game
+
+class RulesTest(unittest.TestCase):
+    def test_deal(self):
+        hands = deal_deck(5, random.Random(2))
+        self.assertEqual(sorted(len(hand) for hand in hands.values()), [10, 11, 11, 11, 11])
+        self.assertEqual(sorted(c for hand in hands.values() for c in hand), list(range(NUM_CARDS)))
+
+    def test_following_a_play(self):
+        game = position({'User': [card(4), card(4, 1), card(6), card(TWO)], 'Player 3': [card(1)]},
+                        'User', pile=[card(5), card(5, 1)])
+        self.assertFalse(game.can_play_cards((card(4), card(4, 1))))  # Lower rank
+        self.assertFalse(game.can_play_cards((card(6),)))  # Wrong number of cards
+        self.assertFalse(game.can_play_cards((card(4), card(6))))  # Mixed ranks
+        self.assertFalse(game.can_play_cards(()))
+        self.assertTrue(game.can_play_cards((card(5, 2), card(5, 3))))  # Same rank is enough
+        self.assertTrue(game.can_play_cards((card(TWO),)))  # 2s go on anything
+        self.assertTrue(game.can_play_cards((BLACK_JOKER,)))
+
+    def test_play_cards_checks_turn_and_hand(self):
+        game = position({'User': [card(4), card(6)], 'Player 3': [card(7), card(8)]}, 'User')
+        self.assertFalse(game.play_cards('Player 3', (card(7),)))  # Not their turn
+        self.assertFalse(game.play_cards('User', (card(7),)))  # Not their card
+        self.assertFalse(game.play_cards('User', (card(4), card(4))))  # Same card twice
+        self.assertFalse(game.pass_turn('Player 3'))
+        self.assertTrue(game.play_cards('User', (card(4),)))
+        self.assertEqual(game.current_player, 'Player 3')
+        self.assertEqual(game.played_cards, [card(4)])
+
+    def test_everyone_passing_frees_the_lead(self):
+        hands = {'User': [card(9), card(10)], 'Player 3': [card(1), card(2)], 'Player 1': [card(3), card(4)]}
+        game = position(hands, 'User')
+        game.play_cards('User', (card(9),))
+        game.pass_turn('Player 3')
+        self.assertFalse(game.is_free_lead())
+        self.assertFalse(game.can_play_cards((card(4),)))
+        game.pass_turn('Player 1')
+        self.assertEqual(game.current_player, 'User')
+        self.assertTrue(game.is_free_lead())
+        self.assertTrue(game.can_play_cards((card(0, 1),)))
+        self.assertNotIn(None, game.legal_moves('User'))
+
+    def test_no_passing_on_a_free_lead(self):
+        game = position({'User': [card(4), card(4, 1), card(9)], 'Player 3': [card(7)]}, 'User')
+        self.assertFalse(game.pass_turn('User'))
+        self.assertEqual(game.current_player, 'User')
+        self.assertTrue(game.play_cards('User', (card(4), card(4, 1))))  # A pair leads
+        self.assertTrue(game.pass_turn('Player 3'))  # A single 7 can't follow it
+
+    def test_two_keeps_the_turn(self):
+        game = position({'User': [card(TWO), card(3)], 'Player 3': [card(1)]}, 'User', pile=[card(8)])
+        self.assertTrue(game.play_cards('User', (card(TWO),)))
+        self.assertEqual(game.current_player, 'User')
+        self.assertTrue(game.is_free_lead())
+
+    def test_legal_moves_are_every_legal_play(self):
+        rng = random.Random(3)
+        for _ in range(200):
+            cards = rng.sample(range(NUM_CARDS), 9)
+            pile_rank = rng.randrange(TWO)
+            size = rng.randint(1, 3)
+            pile = [card(pile_rank, suit) for suit in range(size)]
+            game = position({'User': [c for c in cards[1:] if c not in pile], 'Player 3': cards[:1]},
+                            'User', pile=rng.choice([pile, []]))
+            hand = game.hands['User']
+            moves = game.legal_moves('User')
+            self.assertEqual(None in moves, not game.is_free_lead())
+            plays = {(RANK[move[0]], len(move)) for move in moves if move is not None}
+            self.assertEqual(len(plays), len(moves) - (None in moves))
+            for move in moves:
+                if move is not None:
+                    self.assertTrue(game.can_play_cards(move))
+                    self.assertTrue(all(c in hand for c in move))
+            for rank in range(NUM_RANKS):
+                for n in range(1, hand.counts[rank] + 1):
+                    self.assertEqual((rank, n) in plays, game.can_play_cards(hand.cards_of_rank(rank, n)))
+
+class RoundTest(unittest.TestCase):
+    def test_finishing_order_gives_roles(self):
+        hands = {'User': [card(9)], 'Player 3': [card(1), card(2)], 'Player 1': [card(3)]}
+        game = position(hands, 'User', finished=['Player 2', 'Player 4'])
+        game.play_cards('User', (card(9),))
+        self.assertEqual(game.player_roles['User'], 'Middle')
+        self.assertTrue(game.is_free_lead())  # The next seat leads after someone goes out
+        self.assertEqual(game.current_player, 'Player 3')
+        game.play_cards('Player 3', (card(1),))
+        game.play_cards('Player 1', (card(3),))
+        self.assertEqual(game.player_roles, {'Player 2': 'President', 'Player 4': 'Vice President',
+                                             'User': 'Middle', 'Player 1': 'Vice Bum', 'Player 3': 'Bum'})
+        self.assertTrue(game.game_over)
+        self.assertIn(('round_over', 1), game.drain_events())
+
+    def test_first_round_starts_with_the_three_of_clubs(self):
+        game = GameState(2, rng=random.Random(4))
+        game.start_game()
+        (event,) = [event for event in game.drain_events() if event[0] == 'three_of_clubs']
+        self.assertEqual(game.played_cards, [THREE_OF_CLUBS])
+        self.assertNotIn(THREE_OF_CLUBS, game.hands[event[1]])
+        self.assertEqual(game.current_player, game.get_next_player(event[1]))
+
+    def test_exchange(self):
+        game = position({player: [] for player in player_order}, 'User')
+        game.hands = {
+            'User': Hand([card(0, 1), card(1), card(5), card(9)]),
+            'Player 3': Hand([card(2), card(6), card(7)]),
+            'Player 1': Hand([card(3), card(8)]),
+            'Player 2': Hand([card(4), card(10), card(TWO)]),
+            'Player 4': Hand([card(4, 1), card(11), BLACK_JOKER]),
+        }
+        game.previous_roles = {'User': 'President', 'Player 3': 'Vice President', 'Player 1': 'Middle',
+                               'Player 2': 'Vice Bum', 'Player 4': 'Bum'}
+        sizes = {player: len(hand) for player, hand in game.hands.items()}
+        game.exchange_cards()
+        self.assertEqual(list(game.hands['User']), [card(5), card(9), card(11), BLACK_JOKER])
+        self.assertEqual(list(game.hands['Player 4']), [card(0, 1), card(1), card(4, 1)])
+        self.assertEqual(list(game.hands['Player 3']), [card(6), card(7), card(TWO)])
+        self.assertEqual(list(game.hands['Player 2']), [card(2), card(4), card(10)])
+        self.assertEqual(list(game.hands['Player 1']), [card(3), card(8)])
+        self.assertEqual({player: len(hand) for player, hand in game.hands.items()}, sizes)
+
+    def test_bum_leads_the_next_round(self):
+        game = GameState(2, rng=random.Random(5))
+        game.start_game()
+        while game.rounds_played == 0:
+            game.step()
+        bum = next(player for player, role in game.previous_roles.items() if role == 'Bum')
+        if game.three_of_clubs_played:
+            self.assertNotIn(THREE_OF_CLUBS, game.hands[bum])
+            self.assertEqual(game.current_player, game.get_next_player(bum))
+        else:
+            self.assertEqual(game.current_player, bum)
+        self.assertEqual(len([event for event in game.drain_events() if event[0] == 'exchange']), 2)
+        self.assertEqual(sum(len(hand) for hand in game.hands.values()) + len(game.played_cards), NUM_CARDS)
+
+    def test_games_run_to_the_end(self):
+        for difficulty in ['Easy', 'Medium']:
+            game = GameState(3, rng=random.Random(6), difficulty=difficulty)
+            game.start_game()
+            for _ in range(10000):
+                if game.game_over:
+                    break
+                game.step()
+            self.assertTrue(game.game_over)
+            self.assertEqual(game.rounds_played, 3)
+            self.assertEqual(sorted(game.previous_roles.values()), sorted(roles))
+
+if __name__ == '__main__':
+    unittest.main()
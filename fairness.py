@@ -0,0 +1,121 @@
+import argparse
+import time
+
+import numpy as np
+
+from cards import BLACK_JOKER, NUM_CARDS, RANK, THREE_OF_CLUBS, TWO
+from engine import player_order
+
+# Seat-fairness Monte Carlo. Decks are shuffled and dealt a whole batch at a
+# time as an (N, 54) permutation array, using the same position -> seat rule
+# as engine.deal_deck, and the per-seat statistics are computed with array ops.
+# Run with e.g.
+#   python fairness.py --deals 10000000 --seed 1
+
+NUM_SEATS = len(player_order)
+SEAT_INDEX = {player: i for i, player in enumerate(player_order)}
+
+# Seat (index into player_order) that receives the card dealt at each position
+def deal_positions(num_players=NUM_SEATS):
+    seats = []
+    for i in range(NUM_CARDS):
+        player = f'Player {i % (num_players - 1) + 1}' if i % num_players != 0 else 'User'
+        seats.append(SEAT_INDEX[player])
+    return np.array(seats, dtype=np.int8)
+
+SEAT_OF_POSITION = deal_positions()
+CARD_RANK = np.array(RANK, dtype=np.int16)
+
+# Shuffle `n` decks at once: row k is the order deck k is dealt in
+def shuffle_batch(n, rng):
+    return rng.permuted(np.broadcast_to(np.arange(NUM_CARDS, dtype=np.int8), (n, NUM_CARDS)), axis=1)
+
+# Seat holding each card, shape (n, 54)
+def deal_batch(n, rng):
+    decks = shuffle_batch(n, rng)
+    owner = np.empty((n, NUM_CARDS), dtype=np.int8)
+    np.put_along_axis(owner, decks.astype(np.intp), np.broadcast_to(SEAT_OF_POSITION, (n, NUM_CARDS)), axis=1)
+    return owner
+
+# Per-seat statistics for one batch of deals. Hand strength is the sum of the
+# card ranks held (3 = 0 ... joker = 13).
+def seat_stats(owner):
+    held = owner[:, :, None] == np.arange(NUM_SEATS, dtype=np.int8)  # (n, 54, seats)
+    return {
+        'hand_size': held.sum(axis=1),
+        'jokers': held[:, BLACK_JOKER:].sum(axis=1),
+        'twos': held[:, TWO * 4:BLACK_JOKER].sum(axis=1),
+        'strength': np.einsum('nks,k->ns', held, CARD_RANK, dtype=np.int32),
+        'three_of_clubs': owner[:, THREE_OF_CLUBS],
+    }
+
+class SeatTotals:
+    # Running totals over many batches, so memory stays bounded by the batch size
+
+    def __init__(self):
+        self.deals = 0
+        self.sums = {}
+        self.squares = {}
+        self.histograms = {}
+        self.three_of_clubs = np.zeros(NUM_SEATS, dtype=np.int64)
+
+    def add(self, stats):
+        self.deals += len(stats['three_of_clubs'])
+        self.three_of_clubs += np.bincount(stats['three_of_clubs'], minlength=NUM_SEATS)
+        for name in ('hand_size', 'jokers', 'twos', 'strength'):
+            values = stats[name].astype(np.int64)
+            self.sums[name] = self.sums.get(name, 0) + values.sum(axis=0)
+            self.squares[name] = self.squares.get(name, 0) + (values * values).sum(axis=0)
+            if name != 'strength':
+                histogram = np.stack([np.bincount(values[:, seat], minlength=NUM_CARDS + 1) for seat in range(NUM_SEATS)])
+                self.histograms[name] = self.histograms.get(name, 0) + histogram
+
+    def mean(self, name):
+        return self.sums[name] / self.deals
+
+    def std(self, name):
+        mean = self.mean(name)
+        return np.sqrt(np.maximum(self.squares[name] / self.deals - mean * mean, 0))
+
+def run(deals, batch_size=100000, seed=0):
+    rng = np.random.default_rng(seed)
+    totals = SeatTotals()
+    remaining = deals
+    while remaining > 0:
+        n = min(batch_size, remaining)
+        totals.add(seat_stats(deal_batch(n, rng)))
+        remaining -= n
+    return totals
+
+def print_report(totals, elapsed):
+    print(f"{totals.deals} deals in {elapsed:.2f}s ({totals.deals / elapsed:,.0f} deals/sec)")
+    print()
+    print(f"{'Seat':<10}{'cards':>8}{'jokers':>10}{'twos':>8}{'strength':>16}{'3 of clubs':>12}")
+    for seat, player in enumerate(player_order):
+        print(f"{player:<10}"
+              f"{totals.mean('hand_size')[seat]:>8.2f}"
+              f"{totals.mean('jokers')[seat]:>10.3f}"
+              f"{totals.mean('twos')[seat]:>8.3f}"
+              f"{totals.mean('strength')[seat]:>9.2f} ±{totals.std('strength')[seat]:>5.2f}"
+              f"{totals.three_of_clubs[seat] / totals.deals:>12.1%}")
+
+    print()
+    for name in ('jokers', 'twos'):
+        print(f"Distribution of {name} per seat")
+        for seat, player in enumerate(player_order):
+            histogram = totals.histograms[name][seat][:5]
+            print(f"{player:<10}" + ''.join(f"{count / totals.deals:>9.1%}" for count in histogram))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure how fair the deal is to each seat.")
+    parser.add_argument('--deals', type=int, default=1000000, help="number of decks to deal")
+    parser.add_argument('--batch', type=int, default=100000, help="decks dealt per array batch")
+    parser.add_argument('--seed', type=int, default=0, help="random seed")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    totals = run(args.deals, args.batch, args.seed)
+    print_report(totals, time.perf_counter() - start)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+import pygame
+
+# Paces the UI loops. While something is moving the loop runs at up to `fps`
+# frames a second; otherwise it sleeps in pygame.event.wait() until input
+# arrives (or `idle_ms` passes, so the loop can still check on timers) and only
+# redraws when an event came in or request_redraw() was called.
+#
+#   for event in scheduler.events():
+#       ...
+#   if scheduler.redraw_due():
+#       draw()
+
+class FrameScheduler:
+    def __init__(self, fps=60, idle_ms=250):
+        self.fps = fps
+        self.idle_ms = idle_ms
+        self.clock = pygame.time.Clock()
+        self.dirty = True
+
+    # Something changed that isn't an event (a state change, a timer)
+    def request_redraw(self):
+        self.dirty = True
+
+    # The events for this frame. Blocks while idle; `busy` (something is
+    # animating) keeps frames coming at the FPS cap instead.
+    def events(self, busy=False):
+        if busy or self.dirty:
+            self.clock.tick(self.fps)
+            events = pygame.event.get()
+        else:
+            event = pygame.event.wait(self.idle_ms)
+            events = [] if event.type == pygame.NOEVENT else [event] + pygame.event.get()
+            self.clock.tick()  # Restart the frame timer after sleeping
+        if events or busy:
+            self.dirty = True
+        return events
+
+    # True if the screen needs drawing; clears the request
+    def redraw_due(self):
+        dirty = self.dirty
+        self.dirty = False
+        return dirty
@@ -0,0 +1,142 @@
+from cards import NUM_RANKS
+
+# A hand of integer cards stored as a 54-bit mask (bit n set = card n held)
+# plus a count of cards per rank. Because card ints are in playing order, the
+# lowest set bit is the weakest card and the highest set bit the strongest.
+#
+# The rank histogram is also indexed as it changes: `sets[n]` has bit r set
+# when the hand holds at least n cards of rank r, and `packed` holds the
+# counts 3 bits per rank (the endgame solver's hand key). Questions like
+# "lowest pair at or above rank r" are then one mask and one bit trick.
+
+# RANK_AT_LEAST[r] has a bit set for every card of rank r or higher
+RANK_AT_LEAST = tuple(~((1 << (rank * 4)) - 1) for rank in range(NUM_RANKS))
+
+class Hand:
+    __slots__ = ('mask', 'counts', 'sets', 'packed', 'size')
+
+    def __init__(self, cards=()):
+        self.mask = 0
+        self.counts = [0] * NUM_RANKS
+        self.sets = [0] * 5  # sets[0] is unused
+        self.packed = 0
+        self.size = 0
+        for card in cards:
+            self.add(card)
+
+    # Deal a whole hand at once and build the rank index in one pass
+    @classmethod
+    def from_cards(cls, cards):
+        hand = cls()
+        counts = hand.counts
+        for card in cards:
+            hand.mask |= 1 << card
+            counts[card >> 2] += 1
+        hand.size = sum(counts)
+        for rank, count in enumerate(counts):
+            for n in range(1, count + 1):
+                hand.sets[n] |= 1 << rank
+            hand.packed |= count << (3 * rank)
+        return hand
+
+    def add(self, card):
+        bit = 1 << card
+        if self.mask & bit:
+            raise ValueError(f"card {card} is already in the hand")
+        self.mask |= bit
+        rank = card >> 2
+        count = self.counts[rank] + 1
+        self.counts[rank] = count
+        self.sets[count] |= 1 << rank
+        self.packed += 1 << (3 * rank)
+        self.size += 1
+
+    def remove(self, card):
+        bit = 1 << card
+        if not self.mask & bit:
+            raise ValueError(f"card {card} is not in the hand")
+        self.mask ^= bit
+        rank = card >> 2
+        count = self.counts[rank]
+        self.counts[rank] = count - 1
+        self.sets[count] &= ~(1 << rank)
+        self.packed -= 1 << (3 * rank)
+        self.size -= 1
+
+    def __contains__(self, card):
+        return (self.mask >> card) & 1 == 1
+
+    def __len__(self):
+        return self.size
+
+    # Cards from weakest to strongest
+    def __iter__(self):
+        mask = self.mask
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+    def __repr__(self):
+        return f"Hand({list(self)})"
+
+    def copy(self):
+        other = Hand.__new__(Hand)
+        other.mask = self.mask
+        other.counts = list(self.counts)
+        other.sets = list(self.sets)
+        other.packed = self.packed
+        other.size = self.size
+        return other
+
+    def lowest(self):
+        mask = self.mask
+        return (mask & -mask).bit_length() - 1 if mask else None
+
+    # Weakest card whose rank is at least `rank`, or None
+    def lowest_at_least(self, rank):
+        mask = self.mask & RANK_AT_LEAST[rank]
+        return (mask & -mask).bit_length() - 1 if mask else None
+
+    # Lowest rank at or above `min_rank` with at least `n` cards, or None
+    def lowest_set(self, n, min_rank=0):
+        ranks = self.sets[n] >> min_rank
+        return (ranks & -ranks).bit_length() - 1 + min_rank if ranks else None
+
+    # Ranks held at or above `min_rank`, lowest first
+    def ranks(self, min_rank=0, n=1):
+        ranks = self.sets[n] >> min_rank << min_rank
+        while ranks:
+            low = ranks & -ranks
+            yield low.bit_length() - 1
+            ranks ^= low
+
+    # The `n` weakest cards of `rank` as a tuple (a single, pair, triple or quad)
+    def cards_of_rank(self, rank, n):
+        bits = (self.mask >> (rank * 4)) & 0xF
+        cards = []
+        while bits and len(cards) < n:
+            low = bits & -bits
+            cards.append(rank * 4 + low.bit_length() - 1)
+            bits ^= low
+        return tuple(cards)
+
+    # The n weakest cards, weakest first
+    def worst(self, n):
+        cards = []
+        mask = self.mask
+        while mask and len(cards) < n:
+            low = mask & -mask
+            cards.append(low.bit_length() - 1)
+            mask ^= low
+        return cards
+
+    # The n strongest cards, strongest first
+    def best(self, n):
+        cards = []
+        mask = self.mask
+        while mask and len(cards) < n:
+            card = mask.bit_length() - 1
+            cards.append(card)
+            mask ^= 1 << card
+        return cards
@@ -0,0 +1,72 @@
+import random
+import unittest
+
+from cards import BLACK_JOKER, NUM_CARDS, NUM_RANKS, RANK
+from engine_test import card
+from hand import Hand
+
+class HandTest(unittest.TestCase):
+    def assert_holds(self, hand, cards):
+        expected = Hand.from_cards(cards)
+        self.assertEqual(hand.mask, expected.mask)
+        self.assertEqual(hand.counts, expected.counts)
+        self.assertEqual(len(hand), len(cards))
+        self.assertEqual(list(hand), sorted(cards))
+        for c in range(NUM_CARDS):
+            self.assertEqual(c in hand, c in cards)
+
+    # The rank index kept up to date by add() and remove() matches one built from scratch
+    def assert_indexed(self, hand, cards):
+        self.assert_holds(hand, cards)
+        expected = Hand.from_cards(cards)
+        self.assertEqual(hand.sets, expected.sets)
+        self.assertEqual(hand.packed, expected.packed)
+        for rank in range(NUM_RANKS):
+            count = sum(1 for c in cards if RANK[c] == rank)
+            self.assertEqual((hand.packed >> (3 * rank)) & 7, count)
+            for n in range(1, 5):
+                self.assertEqual(bool(hand.sets[n] >> rank & 1), count >= n)
+
+    def test_index_follows_adds_and_removes(self):
+        rng = random.Random(1)
+        hand, cards = Hand(), set()
+        for _ in range(2000):
+            c = rng.randrange(NUM_CARDS)
+            if c in cards:
+                hand.remove(c)
+                cards.remove(c)
+            else:
+                hand.add(c)
+                cards.add(c)
+            self.assert_indexed(hand, cards)
+
+    def test_copy_is_independent(self):
+        hand = Hand([0, 1, 5])
+        other = hand.copy()
+        other.remove(1)
+        other.add(52)
+        self.assert_indexed(hand, [0, 1, 5])
+        self.assert_indexed(other, [0, 5, 52])
+
+    def test_add_and_remove_check_membership(self):
+        hand = Hand([4])
+        with self.assertRaises(ValueError):
+            hand.add(4)
+        with self.assertRaises(ValueError):
+            hand.remove(5)
+        self.assert_holds(hand, [4])
+
+    def test_queries(self):
+        hand = Hand([card(0, 1), card(2), card(2, 3), card(5), card(5, 1), card(5, 2), BLACK_JOKER])
+        self.assertEqual(hand.lowest(), card(0, 1))
+        self.assertEqual(hand.lowest_at_least(1), card(2))
+        self.assertEqual(hand.lowest_set(2), 2)
+        self.assertEqual(hand.lowest_set(2, 3), 5)
+        self.assertIsNone(hand.lowest_set(4))
+        self.assertEqual(list(hand.ranks(1)), [2, 5, 13])
+        self.assertEqual(hand.cards_of_rank(5, 2), (card(5), card(5, 1)))
+        self.assertEqual(hand.worst(2), [card(0, 1), card(2)])
+        self.assertEqual(hand.best(2), [BLACK_JOKER, card(5, 2)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,12 @@
+from lru import LRUCache
+
+# Pre-composited surfaces for parts of the table that are drawn again and
+# again from the same inputs: an opponent's fan of card backs for a given
+# hand size, the pile for a given set of cards, the dimming overlay. A layer
+# is built the first time its key is asked for and reused until it's evicted,
+# so the key must contain everything the layer depends on; when the inputs
+# change the key changes, and the old layer just ages out of the LRU table.
+
+class LayerCache(LRUCache):
+    def __init__(self, max_entries=64):
+        super().__init__(max_entries)
@@ -0,0 +1,36 @@
+import pygame
+
+# The UI is designed for a 1400x780 window. A Layout maps those design
+# coordinates onto the window's actual size: one scale factor for both axes
+# (so nothing is stretched), with the design area centred in the window and
+# any spare space left as bars at the sides or the top and bottom.
+
+DESIGN_SIZE = (1400, 780)
+
+class Layout:
+    def __init__(self, window_size, design_size=DESIGN_SIZE):
+        self.window_size = tuple(window_size)
+        self.design_size = design_size
+        self.scale = min(window_size[0] / design_size[0], window_size[1] / design_size[1])
+        width, height = round(design_size[0] * self.scale), round(design_size[1] * self.scale)
+        self.area = pygame.Rect((window_size[0] - width) // 2, (window_size[1] - height) // 2, width, height)
+
+    # True when design coordinates are window coordinates
+    def is_identity(self):
+        return self.window_size == tuple(self.design_size)
+
+    def length(self, n):
+        return max(1, round(n * self.scale))
+
+    def size(self, width, height):
+        return (self.length(width), self.length(height))
+
+    def point(self, x, y):
+        return (self.area.x + round(x * self.scale), self.area.y + round(y * self.scale))
+
+    def rect(self, x, y, width, height):
+        return pygame.Rect(self.point(x, y), self.size(width, height))
+
+    # A window position (e.g. the mouse) in design coordinates
+    def to_design(self, pos):
+        return (int((pos[0] - self.area.x) / self.scale), int((pos[1] - self.area.y) / self.scale))
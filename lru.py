@@ -0,0 +1,38 @@
+from collections import OrderedDict
+
+# A bounded table of things that are expensive to make, keyed on everything
+# they depend on. get() builds a missing entry and keeps it; once there are
+# more than `max_entries` the least recently used one is dropped.
+#
+#   cache = LRUCache(64)
+#   layer = cache.get(('seat', player, count), lambda: build_seat_layer(player, count))
+#
+# Entries can't be None, which get() takes to mean "not cached".
+
+class LRUCache:
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.table = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    # The entry for `key`, calling build() to make it if it isn't cached
+    def get(self, key, build):
+        entry = self.table.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.table.move_to_end(key)
+            return entry
+
+        self.misses += 1
+        entry = build()
+        self.table[key] = entry
+        if len(self.table) > self.max_entries:
+            self.table.popitem(last=False)
+        return entry
+
+    def clear(self):
+        self.table.clear()
+
+    def __len__(self):
+        return len(self.table)
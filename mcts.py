@@ -0,0 +1,157 @@
+import math
+import multiprocessing
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import endgame
+from cards import NUM_CARDS
+from hand import Hand
+from engine import roles
+
+# Information-set Monte Carlo tree search for the Hard AI. Each iteration
+# deals the cards the AI can't see at random among the other seats (keeping
+# their hand sizes, and leaving out everything already on the pile), walks one
+# shared tree with UCB, and finishes the round with the Medium AI. The score is
+# the rank the player ends the round with. Small endgames (three or fewer seats
+# holding cards) are scored exactly by the endgame solver instead. With more
+# than one worker the search is root-parallel: each process runs its own tree
+# and the visit counts are added.
+
+EXPLORATION = 0.7
+ENDGAME_CARDS = 16  # Most cards left in play for a position to go to the solver
+
+class Node:
+    __slots__ = ('move', 'parent', 'player', 'children', 'visits', 'availability', 'score')
+
+    def __init__(self, move=None, parent=None, player=None):
+        self.move = move
+        self.parent = parent
+        self.player = player  # Who made `move`
+        self.children = {}
+        self.visits = 0
+        self.availability = 0
+        self.score = 0.0
+
+    def ucb(self):
+        return self.score / self.visits + EXPLORATION * math.sqrt(math.log(self.availability) / self.visits)
+
+# Score of each role, from 1 for President down to 0 for Bum
+ROLE_SCORE = {role: 1 - i / (len(roles) - 1) for i, role in enumerate(roles)}
+
+# A copy of `game` where the hidden hands are re-dealt at random, as `player` could imagine them
+def determinize(game, player, rng):
+    state = game.clone()
+    state.difficulty = 'Medium'
+    state.rounds = state.rounds_played + 1  # Stop at the end of this round
+
+    seen = game.hands[player].mask
+    for card in game.played_cards:
+        seen |= 1 << card
+    unknown = [card for card in range(NUM_CARDS) if not (seen >> card) & 1]
+    rng.shuffle(unknown)
+
+    start = 0
+    for other, hand in game.hands.items():
+        if other != player:
+            state.hands[other] = Hand.from_cards(unknown[start:start + len(hand)])
+            start += len(hand)
+    return state
+
+def apply_move(state, move):
+    if move is None:
+        state.pass_turn(state.current_player)
+    else:
+        state.play_cards(state.current_player, move)
+
+# Run the search for `budget_ms` and return the visit count of each root move
+def search(game, player, budget_ms, seed):
+    rng = random.Random(seed)
+    root = Node()
+    deadline = time.perf_counter() + budget_ms / 1000
+
+    while not root.visits or time.perf_counter() < deadline:
+        state = determinize(game, player, rng)
+        node = root
+
+        # Selection and expansion
+        while not state.round_over:
+            mover = state.current_player
+            moves = state.legal_moves(mover)
+            untried = [move for move in moves if move not in node.children]
+            for move in moves:
+                if move in node.children:
+                    node.children[move].availability += 1
+            if untried:
+                move = rng.choice(untried)
+                child = node.children[move] = Node(move, node, mover)
+                child.availability = 1
+                apply_move(state, move)
+                node = child
+                break
+            node = max((node.children[move] for move in moves), key=Node.ucb)
+            apply_move(state, node.move)
+
+        # Solve small endgames exactly, otherwise roll out with the Medium AI
+        final_roles = None
+        if (not state.round_over and len(state.player_order) <= 3
+                and sum(len(state.hands[player]) for player in state.player_order) <= ENDGAME_CARDS):
+            final_roles = endgame.final_roles(state, deadline)
+        if final_roles is None:
+            while not state.round_over:
+                state.ai_play(state.current_player)
+            final_roles = state.player_roles
+
+        # Backpropagation
+        while node is not None:
+            node.visits += 1
+            if node.player is not None:
+                node.score += ROLE_SCORE[final_roles[node.player]]
+            node = node.parent
+
+    return {move: child.visits for move, child in root.children.items()}
+
+def _search_task(args):
+    return search(*args)
+
+_pool = None
+_pool_workers = 0
+
+# Worker processes are kept between moves so each move doesn't pay for starting them.
+# They are spawned rather than forked: the UI starts the search from a thread while
+# its window is open, which a forked child shouldn't inherit.
+def get_pool(workers):
+    global _pool, _pool_workers
+    if _pool is None or _pool_workers != workers:
+        if _pool is not None:
+            _pool.shutdown()
+        _pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'))
+        _pool_workers = workers
+    return _pool
+
+# The cards the Hard AI plays for `player`, or None to pass
+def choose_cards(game, player, budget_ms=500, workers=1):
+    moves = game.legal_moves(player)
+    if len(moves) == 1:
+        return moves[0]
+
+    # Heads-up, the opponent's hand is everything not seen yet, so solve it exactly
+    deadline = time.perf_counter() + budget_ms / 1000
+    if len(game.player_order) == 2:
+        try:
+            return endgame.best_cards(game, deadline)
+        except endgame.SearchLimit:
+            budget_ms = max(0.0, (deadline - time.perf_counter()) * 1000)  # Search with what's left
+
+    seed = game.rng.getrandbits(32)
+    if workers > 1:
+        tasks = [(game, player, budget_ms, seed + i) for i in range(workers)]
+        results = list(get_pool(workers).map(_search_task, tasks))
+    else:
+        results = [search(game, player, budget_ms, seed)]
+
+    visits = {}
+    for result in results:
+        for move, count in result.items():
+            visits[move] = visits.get(move, 0) + count
+    return max(moves, key=lambda move: visits.get(move, 0))
@@ -0,0 +1,52 @@
+import queue
+import threading
+import traceback
+
+import database
+
+# Writes finished rounds to the database on a background thread, so a round
+# ending never waits for a commit. record() only puts the result on a queue;
+# the writer takes everything queued so far (up to `batch_size` results) and
+# saves it with database.record_round_results() in one transaction.
+#
+#   results_writer.record(user_id, 'President')
+#   ...
+#   results_writer.flush()  # Wait for everything queued to be written
+
+class ResultsWriter:
+    def __init__(self, batch_size=256):
+        self.batch_size = batch_size
+        self.queue = queue.Queue()
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def record(self, user_id, rank):
+        self.start()
+        self.queue.put((user_id, rank))
+
+    def start(self):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name='results-writer', daemon=True)
+                self.thread.start()
+
+    def run(self):
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                database.record_round_results(batch)
+            except Exception:
+                traceback.print_exc()  # Lose this batch rather than stop recording
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    # Block until every result recorded so far has been written
+    def flush(self):
+        if self.thread is not None:
+            self.queue.join()
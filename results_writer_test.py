@@ -0,0 +1,65 @@
+import contextlib
+import io
+import threading
+import unittest
+from unittest import mock
+
+import database
+from results_writer import ResultsWriter
+
+class ResultsWriterTest(unittest.TestCase):
+    def setUp(self):
+        self.batches = []
+        self.writing = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+        patcher = mock.patch.object(database, 'record_round_results', self.record)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    # Stands in for the database; waits for `release` so results can pile up in the queue
+    def record(self, batch):
+        self.writing.set()
+        self.release.wait(5)
+        self.batches.append(list(batch))
+
+    def test_flush_waits_for_everything_recorded(self):
+        writer = ResultsWriter()
+        for i in range(10):
+            writer.record(i, 'President')
+        writer.flush()
+        self.assertEqual([result for batch in self.batches for result in batch], [(i, 'President') for i in range(10)])
+
+    def test_queued_results_are_written_in_batches(self):
+        writer = ResultsWriter(batch_size=4)
+        self.release.clear()
+        writer.record(0, 'Bum')  # Taken on its own while the queue is empty
+        self.writing.wait(5)
+        for i in range(1, 10):
+            writer.record(i, 'Bum')
+        self.release.set()
+        writer.flush()
+        self.assertEqual([len(batch) for batch in self.batches], [1, 4, 4, 1])
+        self.assertEqual([result[0] for batch in self.batches for result in batch], list(range(10)))
+
+    def test_a_failed_batch_doesnt_stop_the_writer(self):
+        def record(batch):
+            if batch[0][0] == 'bad':
+                raise ValueError("no such user")
+            self.batches.append(list(batch))
+
+        writer = ResultsWriter()
+        with mock.patch.object(database, 'record_round_results', record), \
+                contextlib.redirect_stderr(io.StringIO()) as errors:
+            writer.record('bad', 'Bum')
+            writer.flush()
+            writer.record(1, 'Middle')
+            writer.flush()
+        self.assertIn('no such user', errors.getvalue())
+        self.assertEqual(self.batches, [[(1, 'Middle')]])
+
+    def test_flush_without_results_returns(self):
+        ResultsWriter().flush()
+
+if __name__ == '__main__':
+    unittest.main()
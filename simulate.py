@@ -0,0 +1,86 @@
+import argparse
+import random
+import time
+import multiprocessing
+
+from engine import GameState, player_order, roles
+
+# Batch self-play: every seat is driven by the engine's AI, and the games are
+# spread over a process pool. Run with e.g.
+#   python simulate.py --games 100000 --seed 1 --workers 8
+
+# Each game gets its own seed so results don't depend on how games are split between workers
+def game_seed(seed, game_index):
+    return (seed << 32) + game_index
+
+# Play games [start, stop) and return (role counts per seat, rounds played, turns taken)
+def play_games(seed, start, stop, rounds):
+    role_counts = {player: {role: 0 for role in roles} for player in player_order}
+    rounds_played = 0
+    turns = 0
+
+    for game_index in range(start, stop):
+        game = GameState(rounds, rng=random.Random(game_seed(seed, game_index)))
+        game.start_game()
+        while game.step():
+            turns += 1
+        rounds_played += game.rounds_played
+
+        # Every finished round reported one rank per seat
+        for event in game.drain_events():
+            if event[0] == 'rank':
+                role_counts[event[1]][event[2]] += 1
+
+    return role_counts, rounds_played, turns
+
+def _play_chunk(args):
+    return play_games(*args)
+
+def simulate(games, seed=0, workers=1, rounds=5):
+    chunk_size = max(1, min(1000, games // (workers * 8)))
+    chunks = [(seed, start, min(start + chunk_size, games), rounds) for start in range(0, games, chunk_size)]
+
+    role_counts = {player: {role: 0 for role in roles} for player in player_order}
+    rounds_played = 0
+    turns = 0
+
+    if workers > 1:
+        # Spawned rather than forked, so a caller with pygame or threads running can use it too
+        with multiprocessing.get_context('spawn').Pool(workers) as pool:
+            results = list(pool.imap_unordered(_play_chunk, chunks))
+    else:
+        results = [_play_chunk(chunk) for chunk in chunks]
+
+    for chunk_counts, chunk_rounds, chunk_turns in results:
+        for player, counts in chunk_counts.items():
+            for role, count in counts.items():
+                role_counts[player][role] += count
+        rounds_played += chunk_rounds
+        turns += chunk_turns
+
+    return role_counts, rounds_played, turns
+
+def print_report(role_counts, rounds_played, turns, games, elapsed):
+    print(f"{games} games, {rounds_played} rounds in {elapsed:.2f}s ({games / elapsed:.1f} games/sec)")
+    print(f"Average turns per round: {turns / max(rounds_played, 1):.2f}")
+    print()
+    print(f"{'Seat':<10}" + ''.join(f"{role:>16}" for role in roles))
+    for player in player_order:
+        total = sum(role_counts[player].values()) or 1
+        print(f"{player:<10}" + ''.join(f"{role_counts[player][role] / total:>16.1%}" for role in roles))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play President games with every seat driven by the AI.")
+    parser.add_argument('--games', type=int, default=1000, help="number of games to play")
+    parser.add_argument('--rounds', type=int, default=5, help="rounds per game")
+    parser.add_argument('--seed', type=int, default=0, help="base random seed")
+    parser.add_argument('--workers', type=int, default=1, help="number of worker processes")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    role_counts, rounds_played, turns = simulate(args.games, args.seed, args.workers, args.rounds)
+    elapsed = time.perf_counter() - start
+    print_report(role_counts, rounds_played, turns, args.games, elapsed)
+
+if __name__ == '__main__':
+    main()
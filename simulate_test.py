@@ -0,0 +1,23 @@
+import unittest
+
+from engine import player_order, roles
+from simulate import simulate
+
+class SimulateTest(unittest.TestCase):
+    def test_results_dont_depend_on_the_worker_count(self):
+        results = [simulate(40, seed=3, workers=workers, rounds=2) for workers in (1, 2, 3)]
+        self.assertEqual(results[1], results[0])
+        self.assertEqual(results[2], results[0])
+
+    def test_every_round_gives_out_every_role(self):
+        role_counts, rounds_played, turns = simulate(30, seed=4, rounds=3)
+        self.assertEqual(rounds_played, 90)
+        self.assertGreater(turns, rounds_played)
+        for role in roles:
+            self.assertEqual(sum(role_counts[player][role] for player in player_order), rounds_played)
+
+    def test_seeds_change_the_games(self):
+        self.assertNotEqual(simulate(20, seed=5, rounds=1), simulate(20, seed=6, rounds=1))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import json
+import platform
+import time
+from contextlib import contextmanager
+
+# Times the phases of the UI's start-up (imports, the database, the window,
+# fonts, images, the splash screen...) for `President.py --profile-startup`.
+# Phases are timed every launch, which costs next to nothing; the report is
+# only written when asked for.
+#
+#   with startup.phase('load_fonts'):
+#       load_fonts()
+#
+# Deferred phases are work the UI puts off until it's needed (the preferences
+# menu). They're reported separately and not counted in the start-up time.
+
+class StartupProfile:
+    def __init__(self, started=None):
+        self.started = time.perf_counter() if started is None else started
+        self.phases = {}
+        self.deferred = {}
+        self.info = {}  # Anything else worth reporting, e.g. whether the asset cache was warm
+        self.finished = None
+
+    def record(self, name, seconds, deferred=False):
+        (self.deferred if deferred else self.phases)[name] = seconds
+
+    @contextmanager
+    def phase(self, name, deferred=False):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start, deferred)
+
+    # The UI is ready for input
+    def finish(self):
+        self.finished = time.perf_counter()
+
+    # Times in milliseconds; `assets` are the per-asset load times from the AssetLoader
+    def report(self, assets=None):
+        def ms(seconds):
+            return round(seconds * 1000, 2)
+        end = self.finished if self.finished is not None else time.perf_counter()
+        return {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            **self.info,
+            'startup_ms': ms(end - self.started),
+            'phases_ms': {name: ms(seconds) for name, seconds in self.phases.items()},
+            'assets_ms': {name: ms(seconds) for name, seconds in (assets or {}).items()},
+            'deferred_ms': {name: ms(seconds) for name, seconds in self.deferred.items()},
+        }
+
+    # Print the report as JSON, or write it to `path`
+    def write(self, path='-', assets=None):
+        report = json.dumps(self.report(assets), indent=2)
+        if path == '-':
+            print(report, flush=True)  # The UI keeps running, so don't leave it in a pipe's buffer
+        else:
+            with open(path, 'w') as f:
+                f.write(report + '\n')
+            print(f"Saved startup profile to {path}", flush=True)
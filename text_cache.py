@@ -0,0 +1,23 @@
+from lru import LRUCache
+
+# Rendered text surfaces, reused across frames. Menu options, button labels,
+# seat names and messages are the same strings frame after frame, so they are
+# rasterized once and kept in an LRU table keyed on everything that affects
+# the result. Callers must not draw onto the returned surfaces.
+
+class TextCache(LRUCache):
+    def __init__(self, max_entries=512):
+        super().__init__(max_entries)
+
+    def render(self, font, text, antialias, color, background=None):
+        # pygame.Color isn't hashable, so colours are keyed as tuples (names stay strings)
+        key = (font, text, antialias,
+               color if isinstance(color, str) else tuple(color),
+               background if background is None or isinstance(background, str) else tuple(background))
+        return self.get(key, lambda: font.render(text, antialias, color, background))
+
+# Shared by the whole UI
+text_cache = TextCache()
+
+def render_text(font, text, antialias, color, background=None):
+    return text_cache.render(font, text, antialias, color, background)